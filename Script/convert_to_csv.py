@@ -4,14 +4,45 @@ Script para convertir archivos Excel (.xlsx) u OpenDocument (.ods) a CSV sin per
 Uso:
     python convert_to_csv.py archivo.xlsx
     python convert_to_csv.py archivo.ods
+    python convert_to_csv.py archivo.xlsx --sheet Hoja2 --nrows 100 --usecols A:D
 """
-import sys
+import argparse
+import importlib.util
+import os
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
 import pandas as pd
+import pyarrow as pa
 from pathlib import Path
 
+# calamine (lector en Rust) si está instalado; si no, los motores puros de
+# Python: openpyxl para .xlsx y odfpy para .ods (mucho más lentos)
+HAS_CALAMINE = importlib.util.find_spec('python_calamine') is not None
+ODS_ENGINE = 'calamine' if HAS_CALAMINE else 'odf'
 
-def convertir_a_csv(archivo):
-    """Convierte un archivo XLSX o ODS a CSV."""
+# Filas por bloque al escribir el CSV (acota la memoria pico)
+CSV_CHUNKSIZE = 50000
+
+
+def _fechas_a_numpy(df):
+    """Pasa las columnas timestamp[pyarrow] a datetime64 de numpy.
+
+    Así to_csv las escribe como antes de leer con dtype_backend='pyarrow':
+    '2024-01-01' si no tienen hora, sin microsegundos.
+    """
+    for col in df.columns:
+        dtype = df[col].dtype
+        if isinstance(dtype, pd.ArrowDtype) and pa.types.is_timestamp(dtype.pyarrow_dtype):
+            df[col] = df[col].astype('datetime64[ns]')
+    return df
+
+
+def convertir_a_csv(archivo, sheet=0, nrows=None, usecols=None):
+    """Convierte un archivo XLSX o ODS a CSV.
+
+    sheet, nrows y usecols se pasan tal cual a pd.read_excel, de modo que
+    el motor deja de leer filas/columnas que no se van a usar.
+    """
     archivo_path = Path(archivo)
 
     if not archivo_path.exists():
@@ -25,17 +56,35 @@ def convertir_a_csv(archivo):
         return False
 
     try:
-        # Leer el archivo según su extensión
-        if extension == '.xlsx':
-            df = pd.read_excel(archivo_path, sheet_name=0, engine='openpyxl')
+        # Leer el archivo según su extensión (columnas respaldadas por pyarrow)
+        if extension == '.xlsx' and HAS_CALAMINE:
+            df = pd.read_excel(
+                archivo_path, sheet_name=sheet, nrows=nrows, usecols=usecols,
+                engine='calamine', dtype_backend='pyarrow'
+            )
+        elif extension == '.xlsx':
+            # pandas ya abre con openpyxl en read_only/data_only (sin estilos ni fórmulas)
+            df = pd.read_excel(
+                archivo_path, sheet_name=sheet, nrows=nrows, usecols=usecols,
+                engine='openpyxl', dtype_backend='pyarrow'
+            )
         elif extension == '.ods':
-            df = pd.read_excel(archivo_path, sheet_name=0, engine='odf')
+            if ODS_ENGINE == 'odf':
+                print("[!] python-calamine no instalado, usando odfpy (lento)")
+            df = pd.read_excel(
+                archivo_path, sheet_name=sheet, nrows=nrows, usecols=usecols,
+                engine=ODS_ENGINE, dtype_backend='pyarrow'
+            )
 
         # Nombre del archivo CSV de salida
         csv_path = archivo_path.with_suffix('.csv')
 
-        # Guardar como CSV con encoding UTF-8 y delimitador punto y coma
-        df.to_csv(csv_path, index=False, encoding='utf-8', sep=';')
+        # Guardar como CSV con encoding UTF-8, delimitador punto y coma y fin de línea LF.
+        # Se usa to_csv y no el escritor de pyarrow: este entrecomilla todos los
+        # strings y escribe las fechas con hora y microsegundos, y estas columnas
+        # se copian tal cual al CSV de resultados de camino-lote-masivo.
+        _fechas_a_numpy(df).to_csv(csv_path, index=False, encoding='utf-8', sep=';',
+                                   lineterminator='\n', chunksize=CSV_CHUNKSIZE)
 
         print(f"[OK] {archivo} -> {csv_path.name}")
         print(f"  Filas: {len(df)}, Columnas: {len(df.columns)}")
@@ -48,23 +97,34 @@ def convertir_a_csv(archivo):
 
 
 if __name__ == "__main__":
-    if len(sys.argv) < 2:
-        print("Uso: python convert_to_csv.py <archivo.xlsx|archivo.ods>")
-        print("\nEjemplos:")
-        print("  python convert_to_csv.py lote1.xlsx")
-        print("  python convert_to_csv.py lote5.ods")
-        sys.exit(1)
-
-    # Convertir cada archivo pasado como argumento
-    archivos = sys.argv[1:]
-    exitosos = 0
-    fallidos = 0
-
-    for archivo in archivos:
-        if convertir_a_csv(archivo):
-            exitosos += 1
-        else:
-            fallidos += 1
-        print()
+    parser = argparse.ArgumentParser(
+        description='Convierte archivos .xlsx/.ods a CSV (delimitador ;)',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Ejemplos:
+  %(prog)s lote1.xlsx
+  %(prog)s lote5.ods
+  %(prog)s lote1.xlsx --sheet 1 --nrows 100 --usecols A:D
+        """
+    )
+    parser.add_argument('archivos', nargs='+', help='Archivos .xlsx u .ods a convertir')
+    parser.add_argument('--sheet', default='0', help='Hoja a leer: nombre o índice (default: 0)')
+    parser.add_argument('--nrows', type=int, default=None, help='Cantidad máxima de filas a leer')
+    parser.add_argument('--usecols', default=None, help='Columnas a leer, letras de Excel, ej. "A:D" o "A,C:E"')
+    args = parser.parse_args()
+
+    sheet = int(args.sheet) if args.sheet.isdigit() else args.sheet
+    convertir = partial(convertir_a_csv, sheet=sheet, nrows=args.nrows, usecols=args.usecols)
+
+    # Convertir los archivos en paralelo (un proceso por archivo, hasta cpu_count)
+    archivos = args.archivos
+    max_workers = min(len(archivos), os.cpu_count() or 1)
+
+    with ProcessPoolExecutor(max_workers=max_workers) as ex:
+        resultados = list(ex.map(convertir, archivos))
+    print()
+
+    exitosos = sum(resultados)
+    fallidos = len(resultados) - exitosos
 
     print(f"Conversión completada: {exitosos} exitosos, {fallidos} fallidos")
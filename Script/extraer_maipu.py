@@ -8,6 +8,10 @@ import csv
 import re
 from datetime import datetime
 
+import pandas as pd
+import pyarrow as pa
+import pyarrow.csv as pacsv
+
 # Archivo de entrada
 ARCHIVO_ENTRADA = 'resultados_20260130_095244.tsv'
 
@@ -22,58 +26,90 @@ CODIGOS_POSTALES = [
     '5606', '5650', '5651', '5655', '5656', '5658', '5672'
 ]
 
+# Patrón único: código con o sin M, con límites de palabra (\b de Python: Unicode)
+CP_RE = re.compile(r'\bM?(?:' + '|'.join(map(re.escape, CODIGOS_POSTALES)) + r')\b', re.IGNORECASE)
+
+def filtrar_cp(direcciones):
+    """
+    Máscara booleana de las direcciones que contienen alguno de los códigos.
+
+    Se aplica el CP_RE compilado (re de Python) y no str.contains sobre la
+    columna: con strings de Arrow el patrón pasaría por RE2, cuyo \\b es
+    solo ASCII y aceptaría direcciones como "Ñ5515".
+
+    >>> filtrar_cp(pd.Series(['Calle M5515', 'm5606', 'Ñ5515', 'CALLEº5515', None])).tolist()
+    [True, True, False, False, False]
+    """
+    return direcciones.map(lambda d: CP_RE.search(d) is not None, na_action='ignore').fillna(False).astype(bool)
+
+def leer_tsv(fuente):
+    """
+    Lee DNI y dirección (columnas 0 y 1) con el lector CSV de pyarrow.
+
+    Las dos columnas se declaran string al parsear: si se dejara inferir a
+    Arrow, un DNI como "0123" pasaría por int64 y perdería el cero inicial.
+
+    >>> import io
+    >>> leer_tsv(io.BytesIO(b'0123\\tCalle 1 M5515\\n')).loc[0, 'DNI']
+    '0123'
+    """
+    tabla = pacsv.read_csv(
+        fuente,
+        read_options=pacsv.ReadOptions(autogenerate_column_names=True),
+        parse_options=pacsv.ParseOptions(delimiter='\t'),
+        convert_options=pacsv.ConvertOptions(
+            column_types={'f0': pa.string(), 'f1': pa.string()},
+            include_columns=['f0', 'f1'],
+        ),
+    )
+    return tabla.rename_columns(['DNI', 'DIRECCION']).to_pandas()
+
+def leer_tsv_tolerante(ruta):
+    """
+    Lee DNI y dirección con csv.reader, tolerando filas irregulares: descarta las
+    de menos de 2 campos y de las demás toma solo las columnas 0 y 1
+    """
+    with open(ruta, 'r', encoding='utf-8', newline='') as archivo:
+        filas = [fila[:2] for fila in csv.reader(archivo, delimiter='\t')]
+    total = len(filas)
+    df = pd.DataFrame([f for f in filas if len(f) == 2], columns=['DNI', 'DIRECCION'])
+    return df, total
+
 def extraer_maipu():
     """
     Extrae todos los registros que contengan códigos postales específicos en la dirección
     """
-    registros_maipu = []
-    total_registros = 0
-
     print(f"Leyendo archivo: {ARCHIVO_ENTRADA}")
     print(f"Buscando códigos postales: {', '.join(CODIGOS_POSTALES)}\n")
 
     try:
-        with open(ARCHIVO_ENTRADA, 'r', encoding='utf-8') as archivo:
-            # Leer el archivo TSV
-            lector = csv.reader(archivo, delimiter='\t')
-
-            for fila in lector:
-                total_registros += 1
-
-                if len(fila) >= 2:
-                    dni = fila[0]
-                    direccion = fila[1]
-
-                    # Buscar códigos postales en la dirección
-                    # Busca tanto formato "M5515" como "5515"
-                    for codigo in CODIGOS_POSTALES:
-                        # Patrón: busca el código con o sin M, con límites de palabra
-                        patron = r'\b(M?' + codigo + r')\b'
-                        if re.search(patron, direccion, re.IGNORECASE):
-                            registros_maipu.append((dni, direccion))
-                            print(f"✓ Encontrado (CP: {codigo}): {dni} - {direccion}")
-                            break  # Evitar duplicados si hay múltiples códigos en la misma dirección
+        # Leer el archivo TSV completo (solo DNI y dirección) con pyarrow,
+        # sobre el archivo mapeado en memoria (sin copias por la capa de texto)
+        try:
+            with pa.memory_map(ARCHIVO_ENTRADA, 'r') as fuente:
+                df = leer_tsv(fuente)
+            total_registros = len(df)
+        except (pa.ArrowInvalid, pa.ArrowKeyError) as e:
+            # pyarrow exige la misma cantidad de campos en todas las filas
+            print(f"⚠️  Filas irregulares ({e}), usando lector tolerante")
+            df, total_registros = leer_tsv_tolerante(ARCHIVO_ENTRADA)
+
+        # Buscar códigos postales en la dirección en una sola pasada
+        # Busca tanto formato "M5515" como "5515"
+        registros_maipu = df[filtrar_cp(df['DIRECCION'])]
 
         # Guardar resultados
-        if registros_maipu:
-            with open(ARCHIVO_SALIDA, 'w', encoding='utf-8', newline='') as archivo_salida:
-                escritor = csv.writer(archivo_salida, delimiter='\t')
-
-                # Escribir encabezado
-                escritor.writerow(['DNI', 'DIRECCION'])
+        if not registros_maipu.empty:
+            registros_maipu.to_csv(ARCHIVO_SALIDA, sep='\t', index=False)
 
-                # Escribir registros
-                for dni, direccion in registros_maipu:
-                    escritor.writerow([dni, direccion])
-
-            print(f"\n{'='*70}")
+            print(f"{'='*70}")
             print(f"Resumen:")
             print(f"  Total de registros procesados: {total_registros}")
             print(f"  Registros encontrados: {len(registros_maipu)}")
             print(f"  Archivo de salida: {ARCHIVO_SALIDA}")
             print(f"{'='*70}")
         else:
-            print("\n⚠️  No se encontraron registros con los códigos postales especificados")
+            print("⚠️  No se encontraron registros con los códigos postales especificados")
 
     except FileNotFoundError:
         print(f"❌ Error: No se encontró el archivo {ARCHIVO_ENTRADA}")
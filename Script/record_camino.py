@@ -1,6 +1,6 @@
 # -*- coding: utf-8 -*-
 # Genera camino.json registrando mouse+teclado.
-# Requiere: pip install pynput
+# Requiere: pip install pynput (opcional: orjson para serializar más rápido)
 from __future__ import annotations
 from pynput import mouse, keyboard
 from pathlib import Path
@@ -10,15 +10,28 @@ import json
 import argparse
 import os
 import sys
+import threading
 
-# Normalización simple de teclas modificadoras
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Normalización simple de teclas modificadoras (indexado por el enum, sin str())
 _NORMALIZE_KEYS = {
-    str(keyboard.Key.ctrl_l): "Key.ctrl",
-    str(keyboard.Key.ctrl_r): "Key.ctrl",
-    str(keyboard.Key.shift_l): "Key.shift",
-    str(keyboard.Key.shift_r): "Key.shift",
-    str(keyboard.Key.alt_l): "Key.alt",
-    str(keyboard.Key.alt_r): "Key.alt",
+    keyboard.Key.ctrl_l: "Key.ctrl",
+    keyboard.Key.ctrl_r: "Key.ctrl",
+    keyboard.Key.shift_l: "Key.shift",
+    keyboard.Key.shift_r: "Key.shift",
+    keyboard.Key.alt_l: "Key.alt",
+    keyboard.Key.alt_r: "Key.alt",
+}
+
+# Nombre de los botones comunes (el resto, ej. Button.x1/x2, cae a str(button))
+_BTN = {
+    mouse.Button.left: "Button.left",
+    mouse.Button.right: "Button.right",
+    mouse.Button.middle: "Button.middle",
 }
 
 def _key_to_str(key) -> str:
@@ -29,8 +42,37 @@ def _key_to_str(key) -> str:
     except Exception:
         pass
     # Teclas especiales
-    s = str(key)
-    return _NORMALIZE_KEYS.get(s, s)
+    name = _NORMALIZE_KEYS.get(key)
+    return name if name is not None else str(key)
+
+# Tipos de evento: se graban como tuplas (t_ns, tipo, ...) y se pasan
+# al esquema de dict recién al volcar el JSON final.
+EV_CLICK, EV_KEY_DOWN, EV_KEY_UP, EV_MARKER = range(4)
+
+def _dumps(obj) -> bytes:
+    # orjson si está disponible; si no, json de la stdlib
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj, ensure_ascii=False).encode("utf-8")
+
+def _loads(data: bytes):
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+def _dumps_indent(obj, level: int) -> str:
+    # Mismo formato que json.dumps(..., indent=2) del archivo completo,
+    # con el objeto anidado a `level` espacios
+    return json.dumps(obj, ensure_ascii=False, indent=2).replace("\n", "\n" + " " * level)
+
+def _event_to_dict(ev: list) -> dict:
+    t = ev[0] / 1e9
+    kind = ev[1]
+    if kind == EV_CLICK:
+        return {"t": t, "type": "mouse_click", "x": ev[2], "y": ev[3], "button": ev[4], "pressed": ev[5]}
+    if kind == EV_MARKER:
+        return {"t": t, "type": "marker", "name": ev[2]}
+    return {"t": t, "type": "key_down" if kind == EV_KEY_DOWN else "key_up", "key": ev[2]}
 
 def main():
     ap = argparse.ArgumentParser(description="Grabador de camino (clicks + teclado) -> JSON")
@@ -44,82 +86,75 @@ def main():
     out_path.parent.mkdir(parents=True, exist_ok=True)
 
     created_at = datetime.now().isoformat(timespec="seconds")
-    t0 = time.perf_counter()
-    events = []
+    _pc = time.perf_counter_ns
+    t0 = _pc()
     stop_key = getattr(keyboard.Key, stop_key_name.lower(), keyboard.Key.f12)  # F12 por defecto
 
+    # Los eventos se escriben a disco (JSON Lines) a medida que llegan;
+    # los callbacks de pynput corren en hilos distintos, de ahí el lock.
+    # Nombre propio: con --out *.jsonl, with_suffix() apuntaría al mismo out_path
+    jsonl_path = out_path.with_name(out_path.name + ".part.jsonl")
+    fh = jsonl_path.open("wb")
+    lock = threading.Lock()
+    n_events = 0
+
+    def emit(ev: tuple) -> None:
+        nonlocal n_events
+        line = _dumps(ev) + b"\n"
+        with lock:
+            fh.write(line)
+            n_events += 1
+
     print(f"[INFO] Grabando eventos en: {out_path.resolve()}")
     print(f"[INFO] Fin con {stop_key_name}. ESC inserta marcador.")
     print(f"[INFO] Grabando: CLICKS (izquierdo/derecho) + TECLAS")
 
     # Callbacks Mouse - Solo clicks
-    def on_click(x, y, button, pressed):
-        events.append({
-            "t": time.perf_counter() - t0,
-            "type": "mouse_click",
-            "x": int(x),
-            "y": int(y),
-            "button": str(button).replace("Button.", "Button."),
-            "pressed": bool(pressed),
-        })
+    def on_click(x, y, button, pressed, _pc=_pc, _t0=t0, _emit=emit):
+        _emit((_pc() - _t0, EV_CLICK, int(x), int(y),
+               _BTN.get(button) or str(button), bool(pressed)))
 
     # Callbacks Teclado
-    def on_press(key):
+    def on_press(key, _pc=_pc, _t0=t0, _emit=emit):
         # Stop key
         if key == stop_key:
             print(f"[INFO] {stop_key_name} detectado. Finalizando...")
             return False  # detiene listener de teclado
         # ESC => marcador
         if key == keyboard.Key.esc:
-            events.append({
-                "t": time.perf_counter() - t0,
-                "type": "marker",
-                "name": "ESC",
-            })
+            _emit((_pc() - _t0, EV_MARKER, "ESC"))
             return
-        events.append({
-            "t": time.perf_counter() - t0,
-            "type": "key_down",
-            "key": _key_to_str(key),
-        })
-
-    def on_release(key):
-        events.append({
-            "t": time.perf_counter() - t0,
-            "type": "key_up",
-            "key": _key_to_str(key),
-        })
-
-    # Crear listeners (sin movimientos ni scroll)
-    m_listener = mouse.Listener(on_click=on_click)
-    k_listener = keyboard.Listener(on_press=on_press, on_release=on_release)
-
-    # Iniciar
-    m_listener.start()
-    # Esperar a que el keyboard listener termine (F12)
+        _emit((_pc() - _t0, EV_KEY_DOWN, _key_to_str(key)))
+
+    def on_release(key, _pc=_pc, _t0=t0, _emit=emit):
+        _emit((_pc() - _t0, EV_KEY_UP, _key_to_str(key)))
+
+    # Listeners (sin movimientos ni scroll); ambos se detienen al salir del with.
+    # Se espera a que el keyboard listener termine (F12).
     try:
-        with k_listener:
+        with mouse.Listener(on_click=on_click), \
+                keyboard.Listener(on_press=on_press, on_release=on_release) as k_listener:
             k_listener.join()
     except KeyboardInterrupt:
         print("[INFO] Interrumpido por usuario (Ctrl+C)")
 
-    # Asegurar parada del mouse listener
-    try:
-        m_listener.stop()
-    except Exception:
-        pass
+    duration = (_pc() - t0) / 1e9
+    with lock:
+        fh.close()
 
-    duration = time.perf_counter() - t0
-    data = {
-        "created_at": created_at,
-        "duration": duration,
-        "events": events,
-        "meta": {
-            "stop_key": stop_key_name,
-        }
-    }
-    out_path.write_text(json.dumps(data, ensure_ascii=False, indent=2), encoding="utf-8")
-    print(f"[INFO] Guardado: {out_path} ({len(events)} eventos, dur={duration:.2f}s)")
+    # Volcar JSONL -> JSON evento a evento, sin materializar la lista; el
+    # resultado es idéntico a json.dumps(data, ensure_ascii=False, indent=2)
+    meta = {"stop_key": stop_key_name}
+    with out_path.open("w", encoding="utf-8") as out, jsonl_path.open("rb") as src:
+        out.write('{\n  "created_at": ' + _dumps_indent(created_at, 2)
+                  + ',\n  "duration": ' + _dumps_indent(duration, 2)
+                  + ',\n  "events": [')
+        for i, line in enumerate(src):
+            out.write((",\n    " if i else "\n    ") + _dumps_indent(_event_to_dict(_loads(line)), 4))
+        out.write(("\n  ]" if n_events else "]")
+                  + ',\n  "meta": ' + _dumps_indent(meta, 2) + "\n}")
+    jsonl_path.unlink()
+    print(f"[INFO] Guardado: {out_path} ({n_events} eventos, dur={duration:.2f}s)")
 
 if __name__ == "__main__":
     try:
@@ -3,8 +3,8 @@
 
 Lee un CSV con DNIs y para cada uno:
 1. Click en input de busqueda
-2. Ctrl+A + Backspace para limpiar
-3. Escribe el DNI
+2. Ctrl+A para seleccionar el contenido
+3. Pega el DNI desde el portapapeles (o lo escribe si falla el portapapeles)
 4. Enter para buscar
 5. Click derecho en la primera cuenta
 6. Click izquierdo en "Copiar" para copiar el nombre
@@ -29,14 +29,21 @@ Manejo de errores:
 Guarda resultados exitosos y fallos en archivos separados.
 """
 from __future__ import annotations
+import atexit
 import csv
+import io
 import json
 import logging
+import os
+import re
+import subprocess
 import sys
 import time
+import unicodedata
+from dataclasses import dataclass, fields
 from datetime import datetime
 from pathlib import Path
-from typing import Optional, Tuple, List
+from typing import Dict, FrozenSet, Optional, Tuple, List, Union
 
 # ============================================================================
 # CONFIGURACIÓN Y CONSTANTES
@@ -52,18 +59,35 @@ DELAY_DETAIL_OPEN = 1.5
 DELAY_BETWEEN_DNIS = 0.5
 
 # PyAutoGUI
-MOUSE_MOVE_DURATION = 0.1
+PYAUTOGUI_PAUSE = 0.0  # Sin pausa automática: cada acción duerme solo lo que necesita la UI
 KEYBOARD_INTERVAL = 0.05
 
 # Manejo de errores y reintentos
 MAX_CONSECUTIVE_FAILURES = 3
 MAX_POPUP_CLEAR_ATTEMPTS = 5
 CLIPBOARD_RETRY_DELAY = 0.3
+CLIPBOARD_POLL_INTERVAL = 0.02
+# Espera máxima tras un "Copiar": cubre el peor caso de las esperas fijas
+# anteriores (~1.1s); el polling retorna antes si la copia llega.
+CLIPBOARD_WAIT_TIMEOUT = 1.5
 RECOVERY_CLOSE_CLICKS = 4
 
+# Chequeo de sistema bloqueado tras un nombre que no coincide: solo si ya van
+# BLOCK_CHECK_MIN_FAILS fallos seguidos o pasó BLOCK_CHECK_INTERVAL desde el último.
+# CAMINO_ALWAYS_CHECK_BLOCKED=1 vuelve a chequear en cada fallo.
+BLOCK_CHECK_MIN_FAILS = 2
+BLOCK_CHECK_INTERVAL = 30
+ALWAYS_CHECK_BLOCKED = os.getenv('CAMINO_ALWAYS_CHECK_BLOCKED') == '1'
+
+# Si la UI permite buscar con el detalle abierto, CAMINO_KEEP_DETAIL_OPEN=1
+# omite el click de cierre tras cada DNI exitoso (la siguiente búsqueda
+# sobreescribe el input con ctrl+a + pegar).
+KEEP_DETAIL_OPEN = os.getenv('CAMINO_KEEP_DETAIL_OPEN') == '1'
+
 # VPN
 VPN_HOST = "10.167.205.151"
-VPN_CHECK_INTERVAL = 10
+VPN_CHECK_INTERVAL = 2  # Intervalo inicial entre pings con la VPN caída
+VPN_MAX_CHECK_INTERVAL = 30  # Tope del backoff exponencial
 VPN_STABILITY_CHECKS = 3
 VPN_STABILITY_DELAY = 2
 VPN_PING_TIMEOUT = 1000  # ms para Windows
@@ -71,8 +95,12 @@ VPN_PING_TIMEOUT = 1000  # ms para Windows
 # Validación de nombres
 MIN_WORD_LENGTH = 2  # Longitud mínima para comparar palabras en nombres
 
-# Texto esperado en popups
-EXPECTED_POPUP_TEXT = "Búsqueda no guardada"
+# Texto esperado en popups: "Búsqueda no guardada" (y sus variantes: sin tilde / en inglés)
+POPUP_RE = re.compile(r'B[uú]squeda no guardada|Search not saved', re.IGNORECASE)
+POPUP_SCAN_CHARS = 256  # El texto del popup es corto: no escanear un clipboard enorme entero
+
+# Separador de bloques en el log por DNI
+SEP = '=' * 50
 
 # Archivos de salida
 OUTPUT_DIR_DEFAULT = "Result"
@@ -81,6 +109,10 @@ FAILURES_FILE_PREFIX = "fallos"
 VPN_LOG_FILE_PREFIX = "vpn_log"
 SCRAPING_LOG_PREFIX = "scraping"
 FILE_TIMESTAMP_FORMAT = "%Y%m%d_%H%M%S"
+FLUSH_EVERY = 50  # Filas escritas entre cada flush de los archivos de salida
+
+# Saltos de línea -> espacio al guardar la ubicación (una sola pasada)
+_NL_TABLE = str.maketrans({'\n': ' ', '\r': ' '})
 
 # Columnas del CSV de entrada (en orden)
 CSV_INPUT_COLUMNS = [
@@ -89,6 +121,10 @@ CSV_INPUT_COLUMNS = [
     'email', 'Provincia', 'BBDD', 'Generico'
 ]
 
+# Detección de columnas en el CSV de entrada (sin distinguir mayúsculas)
+DNI_COL_RE = re.compile(r'^(?:dni|documento|doc|nro_documento)$', re.IGNORECASE)
+NOMBRE_COL_RE = re.compile(r'nombre|cliente', re.IGNORECASE)
+
 # ============================================================================
 # CONFIGURACIÓN INICIAL
 # ============================================================================
@@ -99,7 +135,6 @@ print = functools.partial(print, flush=True)
 
 # Forzar UTF-8 en stdout/stderr para Windows
 if sys.platform == 'win32':
-    import io
     sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8', errors='replace')
     sys.stderr = io.TextIOWrapper(sys.stderr.buffer, encoding='utf-8', errors='replace')
 
@@ -111,14 +146,54 @@ try:
 except ImportError:
     pyperclip = None
 
+# Intentar importar icmplib para ping ICMP sin lanzar procesos
+try:
+    import icmplib
+except ImportError:
+    icmplib = None
+
+# tkinter (opcional): último fallback de clipboard
+try:
+    import tkinter as tk
+except ImportError:
+    tk = None
+
+# orjson (opcional) para parsear el JSON de coordenadas
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
+
 # Logger global
 logger = logging.getLogger(__name__)
 
+# Logger dedicado al log de VPN (archivo propio, no se propaga a consola)
+vpn_logger = logging.getLogger('vpn')
+
 
 # ============================================================================
 # CONFIGURACIÓN DE LOGGING
 # ============================================================================
 
+class _CachedTimeFormatter(logging.Formatter):
+    """Formatter que formatea asctime una sola vez por segundo.
+
+    Con datefmt sin fracciones de segundo, todos los registros del mismo
+    segundo comparten el texto: se evita un strftime por línea.
+    """
+
+    def __init__(self, fmt: str, datefmt: str):
+        super().__init__(fmt, datefmt=datefmt)
+        self._cached = (-1, '')
+
+    def formatTime(self, record: logging.LogRecord, datefmt: Optional[str] = None) -> str:
+        second = int(record.created)
+        if second != self._cached[0]:
+            self._cached = (second, super().formatTime(record, datefmt))
+        return self._cached[1]
+
+
 def setup_logging(output_dir: Path, timestamp: str) -> Path:
     """Configura el sistema de logging con archivo y consola.
 
@@ -132,14 +207,10 @@ def setup_logging(output_dir: Path, timestamp: str) -> Path:
     log_file = output_dir / f'{SCRAPING_LOG_PREFIX}_{timestamp}.log'
 
     # Configuración base para archivo (nivel DEBUG)
-    logging.basicConfig(
-        level=logging.DEBUG,
-        format='%(asctime)s | %(levelname)-8s | %(message)s',
-        datefmt='%Y-%m-%d %H:%M:%S',
-        filename=str(log_file),
-        filemode='a',
-        encoding='utf-8'
-    )
+    file_handler = logging.FileHandler(log_file, mode='a', encoding='utf-8')
+    file_handler.setFormatter(_CachedTimeFormatter('%(asctime)s | %(levelname)-8s | %(message)s',
+                                                   datefmt='%Y-%m-%d %H:%M:%S'))
+    logging.basicConfig(level=logging.DEBUG, handlers=[file_handler])
 
     # Handler para consola (nivel INFO)
     console = logging.StreamHandler()
@@ -152,7 +223,23 @@ def setup_logging(output_dir: Path, timestamp: str) -> Path:
     return log_file
 
 
-def setup_pyautogui(pause_duration: float = DELAY_CLICK) -> None:
+def setup_vpn_logging(vpn_log_file: Path) -> None:
+    """Asocia el archivo de log VPN a vpn_logger.
+
+    El FileHandler mantiene el archivo abierto durante toda la sesión en
+    lugar de abrirlo y cerrarlo en cada línea.
+
+    Args:
+        vpn_log_file: Path al archivo de log VPN
+    """
+    handler = logging.FileHandler(vpn_log_file, mode='w', encoding='utf-8')
+    handler.setFormatter(_CachedTimeFormatter('[%(asctime)s] %(message)s', datefmt='%Y-%m-%d %H:%M:%S'))
+    vpn_logger.addHandler(handler)
+    vpn_logger.setLevel(logging.INFO)
+    vpn_logger.propagate = False
+
+
+def setup_pyautogui(pause_duration: float = PYAUTOGUI_PAUSE) -> None:
     """Configura PyAutoGUI con opciones seguras.
 
     Args:
@@ -168,6 +255,126 @@ def setup_pyautogui(pause_duration: float = DELAY_CLICK) -> None:
 # ============================================================================
 
 
+CF_UNICODETEXT = 13
+GMEM_MOVEABLE = 0x0002
+
+# Acceso directo a la API de clipboard de Win32 (None fuera de Windows)
+if sys.platform == 'win32':
+    import ctypes
+    from ctypes import wintypes
+    _user32 = ctypes.WinDLL('user32', use_last_error=True)
+    _kernel32 = ctypes.WinDLL('kernel32', use_last_error=True)
+    _user32.OpenClipboard.argtypes = [wintypes.HWND]
+    _user32.OpenClipboard.restype = wintypes.BOOL
+    _user32.GetClipboardData.argtypes = [wintypes.UINT]
+    _user32.GetClipboardData.restype = wintypes.HANDLE
+    _user32.EmptyClipboard.restype = wintypes.BOOL
+    _user32.SetClipboardData.argtypes = [wintypes.UINT, wintypes.HANDLE]
+    _user32.SetClipboardData.restype = wintypes.HANDLE
+    _user32.CloseClipboard.restype = wintypes.BOOL
+    _kernel32.GlobalLock.argtypes = [wintypes.HGLOBAL]
+    _kernel32.GlobalLock.restype = ctypes.c_void_p
+    _kernel32.GlobalUnlock.argtypes = [wintypes.HGLOBAL]
+    _kernel32.GlobalAlloc.argtypes = [wintypes.UINT, ctypes.c_size_t]
+    _kernel32.GlobalAlloc.restype = wintypes.HGLOBAL
+    _kernel32.GlobalFree.argtypes = [wintypes.HGLOBAL]
+    _kernel32.GlobalFree.restype = wintypes.HGLOBAL
+else:
+    _user32 = None
+
+# Root oculto de tkinter, creado una sola vez (fallback fuera de Windows)
+_tk_root = None
+
+
+def _get_tk_root():
+    """Retorna el root oculto de tkinter, creándolo en el primer uso."""
+    global _tk_root
+    if _tk_root is None:
+        if tk is None:
+            raise RuntimeError("tkinter no disponible")
+        _tk_root = tk.Tk()
+        _tk_root.withdraw()
+        atexit.register(_destroy_tk_root)
+    return _tk_root
+
+
+def _destroy_tk_root() -> None:
+    """Destruye el root de tkinter al salir (libera sus handles)."""
+    try:
+        _tk_root.destroy()
+    except Exception:
+        pass
+
+
+def _win32_get_clipboard() -> Optional[str]:
+    """Lee texto unicode del clipboard vía user32.
+
+    Returns:
+        Contenido del portapapeles, o None si no se pudo abrir
+    """
+    if not _user32.OpenClipboard(None):
+        return None
+    try:
+        handle = _user32.GetClipboardData(CF_UNICODETEXT)
+        if not handle:
+            return ''
+        ptr = _kernel32.GlobalLock(handle)
+        if not ptr:
+            return ''
+        try:
+            return ctypes.wstring_at(ptr)
+        finally:
+            _kernel32.GlobalUnlock(handle)
+    finally:
+        _user32.CloseClipboard()
+
+
+def _win32_clear_clipboard() -> bool:
+    """Vacía el clipboard vía user32.
+
+    Returns:
+        True si se pudo vaciar
+    """
+    if not _user32.OpenClipboard(None):
+        return False
+    try:
+        return bool(_user32.EmptyClipboard())
+    finally:
+        _user32.CloseClipboard()
+
+
+def _win32_set_clipboard(text: str) -> bool:
+    """Copia texto unicode al clipboard vía user32.
+
+    Returns:
+        True si se pudo copiar
+    """
+    data = ctypes.create_unicode_buffer(text)
+    size = ctypes.sizeof(data)
+    handle = _kernel32.GlobalAlloc(GMEM_MOVEABLE, size)
+    if not handle:
+        return False
+    ptr = _kernel32.GlobalLock(handle)
+    if not ptr:
+        _kernel32.GlobalFree(handle)
+        return False
+    ctypes.memmove(ptr, data, size)
+    _kernel32.GlobalUnlock(handle)
+
+    if not _user32.OpenClipboard(None):
+        _kernel32.GlobalFree(handle)
+        return False
+    try:
+        _user32.EmptyClipboard()
+        # Si SetClipboardData tiene éxito, el sistema pasa a ser dueño del bloque
+        if not _user32.SetClipboardData(CF_UNICODETEXT, handle):
+            _kernel32.GlobalFree(handle)
+            return False
+        return True
+    finally:
+        _user32.CloseClipboard()
+
+
 def get_clipboard() -> str:
     """Obtiene el contenido del portapapeles.
 
@@ -180,20 +387,25 @@ def get_clipboard() -> str:
         except (Exception,) as e:
             logger.debug(f"Pyperclip falló: {e}")
 
+    # Fallback con user32 (Windows)
+    if _user32:
+        try:
+            content = _win32_get_clipboard()
+            if content is not None:
+                return content
+        except Exception as e:
+            logger.debug(f"user32 falló: {e}")
+
     # Fallback con tkinter
     try:
-        import tkinter as tk
-        root = tk.Tk()
-        root.withdraw()
+        root = _get_tk_root()
         try:
             content = root.clipboard_get()
         except tk.TclError as e:
             logger.debug(f"No se pudo obtener clipboard: {e}")
             content = ''
-        finally:
-            root.destroy()
         return content or ''
-    except (ImportError, Exception) as e:
+    except Exception as e:
         logger.debug(f"Error al acceder clipboard: {e}")
         return ''
 
@@ -207,17 +419,55 @@ def clear_clipboard() -> None:
         except Exception as e:
             logger.debug(f"Error limpiando clipboard con pyperclip: {e}")
 
+    if _user32:
+        try:
+            if _win32_clear_clipboard():
+                return
+        except Exception as e:
+            logger.debug(f"Error limpiando clipboard con user32: {e}")
+
     try:
-        import tkinter as tk
-        root = tk.Tk()
-        root.withdraw()
+        root = _get_tk_root()
         root.clipboard_clear()
         root.update()
-        root.destroy()
     except Exception as e:
         logger.debug(f"Error limpiando clipboard con tkinter: {e}")
 
 
+def set_clipboard(text: str) -> bool:
+    """Copia texto al portapapeles.
+
+    Args:
+        text: Texto a copiar
+
+    Returns:
+        True si se pudo copiar, False en caso contrario
+    """
+    if pyperclip:
+        try:
+            pyperclip.copy(text)
+            return True
+        except Exception as e:
+            logger.debug(f"Error copiando al clipboard con pyperclip: {e}")
+
+    if _user32:
+        try:
+            if _win32_set_clipboard(text):
+                return True
+        except Exception as e:
+            logger.debug(f"Error copiando al clipboard con user32: {e}")
+
+    try:
+        root = _get_tk_root()
+        root.clipboard_clear()
+        root.clipboard_append(text)
+        root.update()
+        return True
+    except Exception as e:
+        logger.debug(f"Error copiando al clipboard con tkinter: {e}")
+        return False
+
+
 def get_clipboard_with_retry(
     max_attempts: int = 3,
     retry_delay: float = CLIPBOARD_RETRY_DELAY
@@ -237,52 +487,89 @@ def get_clipboard_with_retry(
             return content
 
         if attempt < max_attempts - 1:
-            logger.debug(f"Clipboard vacío, reintentando ({attempt + 1}/{max_attempts})")
+            logger.debug("Clipboard vacío, reintentando (%d/%d)", attempt + 1, max_attempts)
             time.sleep(retry_delay)
 
     logger.warning(f"No se pudo obtener clipboard después de {max_attempts} intentos")
     return ''
 
 
+def wait_clipboard(
+    timeout: float = CLIPBOARD_WAIT_TIMEOUT,
+    poll: float = CLIPBOARD_POLL_INTERVAL,
+    sentinel: str = ''
+) -> str:
+    """Espera a que el clipboard cambie y retorna su contenido.
+
+    Reemplaza el sleep fijo tras un "Copiar": retorna apenas el contenido
+    difiere del sentinel (el clipboard se limpia antes de copiar).
+
+    Args:
+        timeout: Segundos máximos de espera
+        poll: Segundos entre lecturas
+        sentinel: Valor que indica que la copia todavía no llegó
+
+    Returns:
+        Contenido del clipboard (puede ser el sentinel si se agotó el tiempo)
+    """
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        content = get_clipboard()
+        if content and content != sentinel:
+            return content
+        time.sleep(poll)
+    return get_clipboard()
+
+
 # ============================================================================
 # UTILIDADES DE VALIDACIÓN
 # ============================================================================
 
 
-def normalize_name(name: str) -> set:
+_NFD = unicodedata.normalize
+
+# Tabla para str.translate que elimina las marcas combinantes (categoría Mn),
+# es decir los acentos que quedan sueltos tras la descomposición NFD
+_COMBINING_STRIP = {c: None for c in range(sys.maxunicode + 1)
+                    if unicodedata.category(chr(c)) == 'Mn'}
+
+
+@functools.lru_cache(maxsize=8192)
+def normalize_name(name: str) -> FrozenSet[str]:
     """Normaliza un nombre y retorna un set de palabras.
 
     Args:
         name: Nombre a normalizar
 
     Returns:
-        Set de palabras normalizadas (sin acentos, en mayúsculas, longitud > MIN_WORD_LENGTH)
+        Frozenset de palabras normalizadas (sin acentos, en mayúsculas, longitud > MIN_WORD_LENGTH)
     """
-    import unicodedata
     # Quitar acentos
-    normalized = unicodedata.normalize('NFD', name)
-    normalized = ''.join(c for c in normalized if unicodedata.category(c) != 'Mn')
+    normalized = _NFD('NFD', name).translate(_COMBINING_STRIP)
     # Convertir a mayusculas y dividir en palabras
     words = normalized.upper().split()
     # Filtrar palabras muy cortas (articulos, etc.)
-    return {w for w in words if len(w) > MIN_WORD_LENGTH}
+    return frozenset(w for w in words if len(w) > MIN_WORD_LENGTH)
 
 
-def names_match(csv_name: str, copied_name: str) -> bool:
+@functools.lru_cache(maxsize=4096)
+def names_match(csv_name: Union[str, FrozenSet[str]], copied_name: str) -> bool:
     """Verifica si al menos un nombre/apellido coincide entre ambos nombres.
 
+    Memoizada: en los reintentos tras una caída de VPN se repiten los mismos
+    pares (nombre CSV, nombre copiado).
+
     Args:
-        csv_name: Nombre del CSV
+        csv_name: Nombre del CSV, o sus palabras ya normalizadas
         copied_name: Nombre copiado del sistema
 
     Returns:
         True si hay al menos una palabra en común
     """
-    csv_words = normalize_name(csv_name)
+    csv_words = normalize_name(csv_name) if isinstance(csv_name, str) else csv_name
     copied_words = normalize_name(copied_name)
     # Verificar si hay al menos una palabra en comun
-    common = csv_words & copied_words
-    return len(common) > 0
+    return not csv_words.isdisjoint(copied_words)
 
 
 # ============================================================================
@@ -290,13 +577,8 @@ def names_match(csv_name: str, copied_name: str) -> bool:
 # ============================================================================
 
 
-def check_vpn() -> bool:
-    """Verifica si la VPN esta activa haciendo ping al host.
-
-    Returns:
-        True si la VPN está activa, False en caso contrario
-    """
-    import subprocess
+def _ping_command() -> bool:
+    """Ping con el comando del sistema (fallback sin icmplib)."""
     try:
         # En Windows usamos -n 1 para un solo ping, -w para timeout en ms
         result = subprocess.run(
@@ -316,14 +598,47 @@ def check_vpn() -> bool:
         return False
 
 
-def wait_for_vpn(vpn_log_file: Path) -> dict:
+# Se pone en False si el sistema no permite sockets ICMP sin privilegios,
+# para no reintentar icmplib (y fallar) en cada chequeo
+_icmplib_usable = icmplib is not None
+
+
+def ping_vpn() -> Tuple[bool, Optional[float]]:
+    """Hace ping al host VPN y mide la latencia.
+
+    Usa icmplib (sin fork/exec) si está disponible; si no, el comando ping.
+
+    Returns:
+        Tupla (activa, rtt_ms); rtt_ms es None si no se pudo medir
+    """
+    global _icmplib_usable
+    if _icmplib_usable:
+        try:
+            host = icmplib.ping(VPN_HOST, count=1, timeout=VPN_PING_TIMEOUT / 1000, privileged=False)
+            return host.is_alive, (host.avg_rtt if host.is_alive else None)
+        except icmplib.SocketPermissionError as e:
+            _icmplib_usable = False
+            logger.warning(f"icmplib sin permisos para ICMP, se usará el comando ping: {e}")
+        except Exception as e:
+            logger.debug(f"icmplib falló, usando comando ping: {e}")
+
+    return _ping_command(), None
+
+
+def check_vpn() -> bool:
+    """Verifica si la VPN esta activa haciendo ping al host.
+
+    Returns:
+        True si la VPN está activa, False en caso contrario
+    """
+    return ping_vpn()[0]
+
+
+def wait_for_vpn() -> dict:
     """Espera hasta que la VPN vuelva a estar disponible.
 
     Realiza pings periódicos al host VPN y valida estabilidad de la conexión
-    antes de reanudar el scraping.
-
-    Args:
-        vpn_log_file: Path al archivo de log donde registrar eventos
+    antes de reanudar el scraping. Los eventos se registran en vpn_logger.
 
     Returns:
         dict con información del evento:
@@ -333,69 +648,77 @@ def wait_for_vpn(vpn_log_file: Path) -> dict:
             - ping_attempts: número de pings realizados
     """
     start_time = datetime.now()
+    start_mono = time.monotonic()  # para la duración (no depende del reloj de pared)
     logger.critical(f"VPN CAIDA DETECTADA - {VPN_HOST}")
     logger.critical(f"SCRAPING DETENIDO - Esperando reconexion VPN...")
     logger.critical("No se procesaran mas DNIs hasta que la VPN vuelva")
 
+    ping_attempts = 0
+
     # Log en tiempo real
-    with vpn_log_file.open('a', encoding='utf-8') as f:
-        f.write(f"\n[{start_time.strftime('%Y-%m-%d %H:%M:%S')}] VPN CAIDA - Scraping detenido\n")
+    vpn_logger.info("VPN CAIDA - Scraping detenido")
+
+    while True:
+        # Backoff exponencial: VPN_CHECK_INTERVAL * 2^(n-1) hasta VPN_MAX_CHECK_INTERVAL.
+        # El timeout del ping fallido se descuenta de la espera en vez de sumarse.
+        failed_pings = 0
+        while True:
+            started = time.monotonic()
+            if check_vpn():
+                break
+            ping_attempts += 1
+            failed_pings += 1
+            interval = min(VPN_MAX_CHECK_INTERVAL, VPN_CHECK_INTERVAL * 2 ** (failed_pings - 1))
+            next_check = started + interval
+            logger.info(f"Ping #{ping_attempts} fallido. Reintentando en {interval}s...")
+
+            # Log cada ping
+            vpn_logger.info(f"Ping #{ping_attempts} - FALLO - proximo en {interval}s")
+
+            remaining = next_check - time.monotonic()
+            if remaining > 0:
+                time.sleep(remaining)
+
+        end_time = datetime.now()
+        duration = time.monotonic() - start_mono
+
+        logger.critical(f"VPN RECONECTADA!")
+        logger.info(f"Tiempo caida: {int(duration // 60)}m {int(duration % 60)}s")
+        logger.info(f"Pings realizados: {ping_attempts}")
+
+        # Log reconexion
+        vpn_logger.info(f"VPN RECONECTADA - "
+                        f"Duracion: {int(duration // 60)}m {int(duration % 60)}s - Pings: {ping_attempts}")
+
+        # Validar estabilidad de la conexion
+        logger.info("Validando estabilidad de la conexion...")
+        stability_ok = True
+
+        for i in range(VPN_STABILITY_CHECKS):
+            time.sleep(VPN_STABILITY_DELAY)
+            alive, rtt = ping_vpn()
+            if alive:
+                rtt_txt = f" ({rtt:.0f} ms)" if rtt is not None else ""
+                logger.debug(f"Ping de estabilidad {i+1}/{VPN_STABILITY_CHECKS}: OK{rtt_txt}")
+                vpn_logger.info(f"Ping estabilidad {i+1}/{VPN_STABILITY_CHECKS}: OK{rtt_txt}")
+            else:
+                logger.warning(f"Ping de estabilidad {i+1}/{VPN_STABILITY_CHECKS}: FALLO - VPN aun inestable")
+                stability_ok = False
+                vpn_logger.info(f"Ping estabilidad {i+1}/{VPN_STABILITY_CHECKS}: FALLO")
+                break
 
-    ping_attempts = 0
-    while not check_vpn():
-        ping_attempts += 1
-        logger.info(f"Ping #{ping_attempts} fallido. Reintentando en {VPN_CHECK_INTERVAL}s...")
-
-        # Log cada ping
-        with vpn_log_file.open('a', encoding='utf-8') as f:
-            f.write(f"[{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] Ping #{ping_attempts} - FALLO\n")
-
-        time.sleep(VPN_CHECK_INTERVAL)
-
-    end_time = datetime.now()
-    duration = (end_time - start_time).total_seconds()
-
-    logger.critical(f"VPN RECONECTADA!")
-    logger.info(f"Tiempo caida: {int(duration // 60)}m {int(duration % 60)}s")
-    logger.info(f"Pings realizados: {ping_attempts}")
-
-    # Log reconexion inicial
-    with vpn_log_file.open('a', encoding='utf-8') as f:
-        f.write(f"[{end_time.strftime('%Y-%m-%d %H:%M:%S')}] VPN RECONECTADA - "
-                f"Duracion: {int(duration // 60)}m {int(duration % 60)}s - Pings: {ping_attempts}\n")
-
-    # Validar estabilidad de la conexion
-    logger.info("Validando estabilidad de la conexion...")
-    stability_ok = True
-
-    for i in range(VPN_STABILITY_CHECKS):
-        time.sleep(VPN_STABILITY_DELAY)
-        if check_vpn():
-            logger.debug(f"Ping de estabilidad {i+1}/{VPN_STABILITY_CHECKS}: OK")
-            with vpn_log_file.open('a', encoding='utf-8') as f:
-                f.write(f"[{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] "
-                       f"Ping estabilidad {i+1}/{VPN_STABILITY_CHECKS}: OK\n")
-        else:
-            logger.warning(f"Ping de estabilidad {i+1}/{VPN_STABILITY_CHECKS}: FALLO - VPN aun inestable")
-            stability_ok = False
-            with vpn_log_file.open('a', encoding='utf-8') as f:
-                f.write(f"[{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] "
-                       f"Ping estabilidad {i+1}/{VPN_STABILITY_CHECKS}: FALLO\n")
+        if stability_ok:
             break
 
-    if stability_ok:
-        logger.info("Conexion VPN ESTABLE")
-        with vpn_log_file.open('a', encoding='utf-8') as f:
-            f.write(f"[{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] Conexion ESTABLE - Scraping reanudado\n")
-        logger.info("SCRAPING SE REANUDARA en 3 segundos...")
-        time.sleep(3)
-    else:
         logger.warning("Conexion inestable, esperando 10s y revalidando...")
-        with vpn_log_file.open('a', encoding='utf-8') as f:
-            f.write(f"[{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] Conexion inestable - Esperando\n")
+        vpn_logger.info("Conexion inestable - Esperando")
         time.sleep(10)
-        # Reintentar validacion recursivamente
-        return wait_for_vpn(vpn_log_file)
+
+    logger.info("Conexion VPN ESTABLE")
+    vpn_logger.info("Conexion ESTABLE - Scraping reanudado")
+
+    logger.info("SCRAPING SE REANUDARA en 3 segundos...")
+    time.sleep(3)
 
     return {
         'start': start_time,
@@ -405,34 +728,21 @@ def wait_for_vpn(vpn_log_file: Path) -> dict:
     }
 
 
-def reconnect_click_action(coords: dict, vpn_log_file: Optional[Path] = None) -> None:
+def reconnect_click_action(coords: Coords) -> None:
     """Realiza el click de reconexion y presiona Enter.
 
     Este click se hace despues de que la VPN vuelve para activar
     el sistema antes de limpiar popups.
 
     Args:
-        coords: Diccionario con coordenadas
-        vpn_log_file: Path opcional al archivo de log VPN
+        coords: Coordenadas validadas
     """
-    reconnect = coords.get('reconnect_click', {})
-
-    if not reconnect.get('x') or not reconnect.get('y'):
-        logger.warning("Coordenadas de reconnect_click no configuradas, saltando...")
-        if vpn_log_file:
-            with vpn_log_file.open('a', encoding='utf-8') as f:
-                f.write(f"[{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] "
-                       f"ADVERTENCIA: Coordenadas reconnect_click no configuradas\n")
-        return
+    x, y = coords.reconnect_click
 
-    logger.info(f"Realizando click de reconexion en ({reconnect['x']}, {reconnect['y']})...")
-    if vpn_log_file:
-        with vpn_log_file.open('a', encoding='utf-8') as f:
-            f.write(f"[{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] "
-                   f"Click reconexion ({reconnect['x']}, {reconnect['y']}) + Enter\n")
+    logger.info(f"Realizando click de reconexion en ({x}, {y})...")
+    vpn_logger.info(f"Click reconexion ({x}, {y}) + Enter")
 
-    pg.moveTo(reconnect['x'], reconnect['y'], duration=MOUSE_MOVE_DURATION)
-    pg.click()
+    pg.click(x, y)
     time.sleep(DELAY_MEDIUM)
 
     logger.debug("Presionando Enter...")
@@ -442,29 +752,29 @@ def reconnect_click_action(coords: dict, vpn_log_file: Optional[Path] = None) ->
     logger.info("Click de reconexion completado")
 
 
-def clear_vpn_popup(coords: dict, vpn_log_file: Optional[Path] = None) -> None:
+def popup_text_found(copied: str) -> bool:
+    """Indica si el texto copiado corresponde al popup esperado.
+
+    Args:
+        copied: Contenido del clipboard
+
+    Returns:
+        True si el inicio del texto contiene el mensaje del popup
+    """
+    return POPUP_RE.search(copied, 0, POPUP_SCAN_CHARS) is not None
+
+
+def clear_vpn_popup(coords: Coords) -> None:
     """Limpia los popups que aparecen cuando la VPN se desconecta.
 
     Intenta copiar texto esperado del menu contextual.
     Si no lo logra, presiona Enter y reintenta.
 
     Args:
-        coords: Diccionario con coordenadas
-        vpn_log_file: Path opcional al archivo de log VPN
+        coords: Coordenadas validadas
     """
     logger.info("Limpiando posibles popups de VPN...")
 
-    popup_right = coords.get('popup_right_click', {})
-    popup_copy = coords.get('popup_copy_menu', {})
-
-    if not popup_right.get('x') or not popup_copy.get('x'):
-        logger.warning("Coordenadas de popup no configuradas, saltando limpieza")
-        if vpn_log_file:
-            with vpn_log_file.open('a', encoding='utf-8') as f:
-                f.write(f"[{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] "
-                       f"ADVERTENCIA: Coordenadas popup no configuradas\n")
-        return
-
     for attempt in range(MAX_POPUP_CLEAR_ATTEMPTS):
         logger.debug(f"Intento {attempt + 1}/{MAX_POPUP_CLEAR_ATTEMPTS} de limpiar popup...")
 
@@ -473,24 +783,18 @@ def clear_vpn_popup(coords: dict, vpn_log_file: Optional[Path] = None) -> None:
         time.sleep(DELAY_SHORT)
 
         # Click derecho en el area del popup
-        pg.moveTo(popup_right['x'], popup_right['y'], duration=MOUSE_MOVE_DURATION)
-        pg.rightClick()
+        pg.rightClick(*coords.popup_right_click)
         time.sleep(DELAY_MEDIUM)
 
         # Click en copiar
-        pg.moveTo(popup_copy['x'], popup_copy['y'], duration=MOUSE_MOVE_DURATION)
-        pg.click()
-        time.sleep(CLIPBOARD_RETRY_DELAY)
+        pg.click(*coords.popup_copy_menu)
 
         # Verificar si se copio el texto esperado
-        copied = get_clipboard()
+        copied = wait_clipboard()
 
-        if EXPECTED_POPUP_TEXT in copied:
+        if popup_text_found(copied):
             logger.info(f"Popup limpiado correctamente (copiado: '{copied[:30]}...')")
-            if vpn_log_file:
-                with vpn_log_file.open('a', encoding='utf-8') as f:
-                    f.write(f"[{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] "
-                           f"Popup limpiado (intento {attempt + 1})\n")
+            vpn_logger.info(f"Popup limpiado (intento {attempt + 1})")
             return
 
         # Si no se copio, presionar Enter para cerrar cualquier dialogo
@@ -501,49 +805,35 @@ def clear_vpn_popup(coords: dict, vpn_log_file: Optional[Path] = None) -> None:
         time.sleep(DELAY_MEDIUM)
 
     logger.warning("No se pudo confirmar limpieza de popup, continuando de todos modos...")
-    if vpn_log_file:
-        with vpn_log_file.open('a', encoding='utf-8') as f:
-            f.write(f"[{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] "
-                   f"Popup no confirmado tras {MAX_POPUP_CLEAR_ATTEMPTS} intentos\n")
+    vpn_logger.info(f"Popup no confirmado tras {MAX_POPUP_CLEAR_ATTEMPTS} intentos")
 
 
 # ============================================================================
 # RECUPERACIÓN DE SISTEMA BLOQUEADO
 # ============================================================================
 
-def check_system_blocked(coords: dict) -> bool:
+def check_system_blocked(coords: Coords) -> bool:
     """Verifica si el sistema está bloqueado intentando copiar texto esperado.
 
     Args:
-        coords: Diccionario con coordenadas
+        coords: Coordenadas validadas
 
     Returns:
         True si el sistema está bloqueado, False si está OK
     """
-    popup_right = coords.get('popup_right_click', {})
-    popup_copy = coords.get('popup_copy_menu', {})
-
-    if not popup_right.get('x') or not popup_copy.get('x'):
-        logger.warning("No se pueden verificar bloqueos (coordenadas popup faltantes)")
-        return False
-
     clear_clipboard()
-    time.sleep(DELAY_SHORT)
 
     # Click derecho en el area del popup
-    pg.moveTo(popup_right['x'], popup_right['y'], duration=MOUSE_MOVE_DURATION)
-    pg.rightClick()
+    pg.rightClick(*coords.popup_right_click)
     time.sleep(DELAY_MEDIUM)
 
     # Click izquierdo en copiar
-    pg.moveTo(popup_copy['x'], popup_copy['y'], duration=MOUSE_MOVE_DURATION)
-    pg.click()
-    time.sleep(CLIPBOARD_RETRY_DELAY)
+    pg.click(*coords.popup_copy_menu)
 
     # Verificar si se copio el texto esperado
-    copied = get_clipboard()
+    copied = wait_clipboard()
 
-    if EXPECTED_POPUP_TEXT in copied:
+    if popup_text_found(copied):
         logger.debug("Sistema OK - popup copiado correctamente")
         return False  # No está bloqueado
     else:
@@ -551,66 +841,71 @@ def check_system_blocked(coords: dict) -> bool:
         return True  # Está bloqueado
 
 
-def execute_system_recovery(coords: dict, log_file: Optional[Path] = None) -> bool:
+@dataclass(slots=True)
+class BlockCheckState:
+    """Estado del throttle del chequeo de bloqueo; uno por corrida (run)."""
+    last_check_ts: float = 0.0
+    consecutive_fails: int = 0
+
+
+def should_check_blocked(state: BlockCheckState) -> bool:
+    """Decide si corresponde verificar bloqueo tras un nombre fallido.
+
+    Args:
+        state: Estado del throttle de la corrida actual
+
+    Returns:
+        True si hay que correr check_system_blocked
+    """
+    if ALWAYS_CHECK_BLOCKED:
+        return True
+    return (state.consecutive_fails >= BLOCK_CHECK_MIN_FAILS
+            or time.monotonic() - state.last_check_ts > BLOCK_CHECK_INTERVAL)
+
+
+def execute_system_recovery(coords: Coords) -> bool:
     """Ejecuta la secuencia de recuperación del sistema bloqueado.
 
     Secuencia: reconnect_click -> 4x close_btn -> btn_house
 
     Args:
-        coords: Diccionario con coordenadas
-        log_file: Path opcional al archivo de log
+        coords: Coordenadas validadas
 
     Returns:
-        True si se ejecutó correctamente, False si faltan coordenadas
+        True al completar la secuencia
     """
     logger.warning("Ejecutando recuperación de sistema bloqueado")
 
-    if log_file:
-        with log_file.open('a', encoding='utf-8') as f:
-            f.write(f"[{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] "
-                   f"Sistema bloqueado - Ejecutando recuperacion\n")
+    vpn_logger.info("Sistema bloqueado - Ejecutando recuperacion")
 
     # Click en reconnect_click
-    reconnect = coords.get('reconnect_click', {})
-    if reconnect.get('x') and reconnect.get('y'):
-        logger.debug(f"Click reconnect ({reconnect['x']}, {reconnect['y']})")
-        pg.moveTo(reconnect['x'], reconnect['y'], duration=MOUSE_MOVE_DURATION)
-        pg.click()
-        time.sleep(DELAY_MEDIUM)
-    else:
-        logger.error("Falta coordenada: reconnect_click")
-        return False
+    logger.debug("Click reconnect %s", coords.reconnect_click)
+    pg.click(*coords.reconnect_click)
+    time.sleep(DELAY_MEDIUM)
 
     # 4x close_btn
-    close_btn = coords.get('close_btn', {})
-    if close_btn.get('x') and close_btn.get('y'):
-        logger.debug(f"Presionando close button {RECOVERY_CLOSE_CLICKS} veces")
+    logger.debug("Presionando close button %d veces", RECOVERY_CLOSE_CLICKS)
+    # El cursor queda sobre el botón: un solo moveTo para todos los clicks
+    pg.moveTo(*coords.close_btn)
+    # Sin chequeo de failsafe dentro del loop: el cursor no se mueve entre clicks
+    prev_failsafe = pg.FAILSAFE
+    pg.FAILSAFE = False
+    try:
         for i in range(RECOVERY_CLOSE_CLICKS):
-            pg.moveTo(close_btn['x'], close_btn['y'], duration=MOUSE_MOVE_DURATION)
             pg.click()
             time.sleep(DELAY_MEDIUM)
-            logger.debug(f"  Click close #{i+1}")
-    else:
-        logger.error("Falta coordenada: close_btn")
-        return False
+            logger.debug("  Click close #%d", i + 1)
+    finally:
+        pg.FAILSAFE = prev_failsafe
 
     # Click en btn_house
-    recovery = coords.get('btn_house', {})
-    if recovery.get('x') and recovery.get('y'):
-        logger.debug(f"Click recovery ({recovery['x']}, {recovery['y']})")
-        pg.moveTo(recovery['x'], recovery['y'], duration=MOUSE_MOVE_DURATION)
-        pg.click()
-        time.sleep(DELAY_LONG)
-        logger.info("Recuperación completada")
-
-        if log_file:
-            with log_file.open('a', encoding='utf-8') as f:
-                f.write(f"[{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] "
-                       f"Recuperacion ejecutada - reconnect + {RECOVERY_CLOSE_CLICKS}x close + btn_house\n")
-        return True
-    else:
-        logger.error("Falta coordenada: btn_house")
-        return False
+    logger.debug("Click recovery %s", coords.btn_house)
+    pg.click(*coords.btn_house)
+    time.sleep(DELAY_LONG)
+    logger.info("Recuperación completada")
+
+    vpn_logger.info(f"Recuperacion ejecutada - reconnect + {RECOVERY_CLOSE_CLICKS}x close + btn_house")
+    return True
 
 
 # ============================================================================
@@ -618,47 +913,79 @@ def execute_system_recovery(coords: dict, log_file: Optional[Path] = None) -> bo
 # ============================================================================
 
 
+# Claves que debe definir el JSON de coordenadas
+_REQUIRED_KEYS = (
+    'dni_input',
+    'first_result',
+    'copy_name_menu',
+    'right_click_address',
+    'select_all_menu',
+    'right_click_copy',
+    'copy_menu',
+    'close_btn',
+    'reconnect_click',
+    'popup_right_click',
+    'popup_copy_menu',
+    'btn_house',
+)
+
+
+@dataclass(frozen=True, slots=True)
+class Coords:
+    """Coordenadas (x, y) de cada elemento de la UI, validadas al cargar."""
+    dni_input: Tuple[int, int]
+    first_result: Tuple[int, int]
+    copy_name_menu: Tuple[int, int]
+    right_click_address: Tuple[int, int]
+    select_all_menu: Tuple[int, int]
+    right_click_copy: Tuple[int, int]
+    copy_menu: Tuple[int, int]
+    close_btn: Tuple[int, int]
+    reconnect_click: Tuple[int, int]
+    popup_right_click: Tuple[int, int]
+    popup_copy_menu: Tuple[int, int]
+    btn_house: Tuple[int, int]
+
+    @classmethod
+    def from_dict(cls, coords: dict) -> Coords:
+        """Construye Coords desde el JSON ya validado."""
+        return cls(**{f.name: (int(coords[f.name]['x']), int(coords[f.name]['y'])) for f in fields(cls)})
+
+
 def validate_coordinates(coords: dict) -> Tuple[bool, List[str]]:
     """Valida que todas las coordenadas requeridas estén presentes.
 
+    Una coordenada es válida si x e y son numéricos; 0 se acepta
+    (borde superior/izquierdo de la pantalla).
+
     Args:
         coords: Diccionario con coordenadas
 
     Returns:
         Tupla (valid, missing_keys) con bool de validez y lista de claves faltantes
     """
-    required_keys = [
-        'dni_input',
-        'first_result',
-        'copy_name_menu',
-        'right_click_address',
-        'select_all_menu',
-        'right_click_copy',
-        'copy_menu',
-        'close_btn',
-        'reconnect_click',
-        'popup_right_click',
-        'popup_copy_menu',
-        'btn_house'
-    ]
-
     missing = []
-    for key in required_keys:
-        coord = coords.get(key, {})
-        if not coord.get('x') or not coord.get('y'):
+    for key in _REQUIRED_KEYS:
+        coord = coords.get(key)
+        if not isinstance(coord, dict):
+            missing.append(key)
+            continue
+        x = coord.get('x')
+        y = coord.get('y')
+        if not isinstance(x, (int, float)) or not isinstance(y, (int, float)):
             missing.append(key)
 
     return len(missing) == 0, missing
 
 
-def load_coords(path: Path) -> dict:
+def load_coords(path: Path) -> Coords:
     """Carga y valida las coordenadas desde el JSON.
 
     Args:
         path: Path al archivo JSON con coordenadas
 
     Returns:
-        Diccionario con coordenadas validadas
+        Coords con las coordenadas validadas
 
     Raises:
         SystemExit si el archivo no existe o las coordenadas son inválidas
@@ -667,8 +994,7 @@ def load_coords(path: Path) -> dict:
         logger.error(f"No existe el archivo de coordenadas: {path}")
         sys.exit(1)
 
-    with path.open('r', encoding='utf-8') as f:
-        coords = json.load(f)
+    coords = _json_loads(path.read_bytes())
 
     # Validar coordenadas
     valid, missing = validate_coordinates(coords)
@@ -679,7 +1005,7 @@ def load_coords(path: Path) -> dict:
         sys.exit(1)
 
     logger.info("Coordenadas validadas correctamente")
-    return coords
+    return Coords.from_dict(coords)
 
 
 # ============================================================================
@@ -694,12 +1020,12 @@ def click(x: int, y: int, label: str, delay: float = DELAY_CLICK) -> None:
         x: Coordenada X
         y: Coordenada Y
         label: Etiqueta descriptiva para logging
-        delay: Tiempo de espera después del click (usa PAUSE global de PyAutoGUI también)
+        delay: Tiempo de espera después del click
     """
-    logger.debug(f"Click en {label} ({x}, {y})")
-    pg.moveTo(x, y, duration=MOUSE_MOVE_DURATION)
-    pg.click()
-    time.sleep(delay)
+    logger.debug("Click en %s (%d, %d)", label, x, y)
+    pg.click(x, y)
+    if delay:
+        time.sleep(delay)
 
 
 def right_click(x: int, y: int, label: str, delay: float = DELAY_CLICK) -> None:
@@ -711,22 +1037,23 @@ def right_click(x: int, y: int, label: str, delay: float = DELAY_CLICK) -> None:
         label: Etiqueta descriptiva para logging
         delay: Tiempo de espera después del click
     """
-    logger.debug(f"Click derecho en {label} ({x}, {y})")
-    pg.moveTo(x, y, duration=MOUSE_MOVE_DURATION)
-    pg.rightClick()
-    time.sleep(delay)
+    logger.debug("Click derecho en %s (%d, %d)", label, x, y)
+    pg.rightClick(x, y)
+    if delay:
+        time.sleep(delay)
 
 
 def type_text(text: str, delay: float = DELAY_CLICK) -> None:
-    """Escribe texto caracter por caracter.
+    """Escribe texto con una sola llamada a typewrite.
+
+    PyAutoGUI ya aplica KEYBOARD_INTERVAL entre caracteres internamente.
 
     Args:
         text: Texto a escribir
         delay: Tiempo de espera después de escribir
     """
-    logger.debug(f"Escribiendo: {text}")
-    for char in text:
-        pg.typewrite(char, interval=KEYBOARD_INTERVAL)
+    logger.debug("Escribiendo: %s", text)
+    pg.typewrite(text, interval=KEYBOARD_INTERVAL)
     time.sleep(delay)
 
 
@@ -735,8 +1062,66 @@ def type_text(text: str, delay: float = DELAY_CLICK) -> None:
 # ============================================================================
 
 
+def truncate_torn_line(path: Path) -> None:
+    """Descarta la última línea si quedó incompleta (sin salto de línea).
+
+    Un corte abrupto puede dejar una fila a medio escribir; al retomar con
+    --resume, el append la pegaría con la siguiente. Se lee solo el final del
+    archivo hacia atrás hasta el último salto de línea.
+
+    Args:
+        path: Archivo de texto a reparar (si no existe, no hace nada)
+    """
+    try:
+        size = path.stat().st_size
+    except FileNotFoundError:
+        return
+    if size == 0:
+        return
+
+    with path.open('r+b') as f:
+        f.seek(-1, os.SEEK_END)
+        if f.read(1) == b'\n':
+            return
+        pos = size
+        while pos > 0:
+            step = min(4096, pos)
+            pos -= step
+            f.seek(pos)
+            i = f.read(step).rfind(b'\n')
+            if i != -1:
+                f.truncate(pos + i + 1)
+                break
+        else:
+            f.truncate(0)
+    logger.warning(f"Línea incompleta descartada al final de {path.name}")
+
+
+def progress_sidecar(progress_file: Path) -> Path:
+    """Path del sidecar de progreso junto al CSV de resultados.
+
+    Tiene un DNI por línea y, tras cada flush, una línea '#<bytes>' con el
+    tamaño que tenía el CSV en ese momento (ver BufferedCsvWriter.flush).
+    """
+    return progress_file.with_suffix('.processed')
+
+
+def _append_sidecar(sidecar: Path, dnis, csv_size: int, mode: str = 'a') -> None:
+    """Agrega DNIs al sidecar seguidos de la marca de tamaño del CSV."""
+    with sidecar.open(mode, encoding='utf-8') as f:
+        f.write(''.join(f"{dni}\n" for dni in dnis) + f"#{csv_size}\n")
+
+
 def load_progress(progress_file: Path) -> set:
-    """Carga los DNIs ya procesados desde archivo CSV.
+    """Carga los DNIs ya procesados.
+
+    Lee el sidecar de progreso si existe; si no, parsea el CSV de resultados
+    y deja el sidecar creado para el próximo reinicio.
+
+    El sidecar se escribe después del CSV, así que un corte entre ambos deja
+    filas en el CSV que el sidecar no lista: se recuperan parseando solo el
+    CSV desde la última marca '#<bytes>'. Si el CSV quedó más corto que la
+    marca (se perdió lo no sincronizado), se vuelve a parsear entero.
 
     Args:
         progress_file: Path al archivo de progreso (CSV)
@@ -744,182 +1129,355 @@ def load_progress(progress_file: Path) -> set:
     Returns:
         Set de DNIs ya procesados
     """
+    sidecar = progress_sidecar(progress_file)
+    truncate_torn_line(progress_file)
+    truncate_torn_line(sidecar)
+    csv_size = progress_file.stat().st_size if progress_file.exists() else 0
+
+    if sidecar.exists():
+        processed = set()
+        mark = 0
+        for line in sidecar.read_text(encoding='utf-8').splitlines():
+            if line.startswith('#'):
+                mark = int(line[1:])
+            elif line:
+                processed.add(line)
+
+        if csv_size == mark:
+            return processed
+        if csv_size > mark:
+            tail = _load_progress_csv(progress_file, start=mark)
+            if tail - processed:
+                logger.warning(f"{len(tail - processed)} DNIs del CSV no estaban en {sidecar.name}")
+            processed |= tail
+            _append_sidecar(sidecar, tail, csv_size)
+            return processed
+        logger.warning(f"{progress_file.name} es más corto que lo registrado en {sidecar.name}: se reparsea")
+
     if not progress_file.exists():
         return set()
 
+    processed = _load_progress_csv(progress_file)
+    if processed:
+        _append_sidecar(sidecar, processed, csv_size, mode='w')
+    return processed
+
+
+def _load_progress_csv(progress_file: Path, start: int = 0) -> set:
+    """Extrae la columna DNI del CSV de resultados.
+
+    Args:
+        progress_file: Path al CSV de resultados
+        start: Offset en bytes (inicio de un registro) desde el que leer las
+            filas; el header se lee siempre del comienzo
+    """
     processed = set()
-    with progress_file.open('r', encoding='utf-8') as f:
-        reader = csv.DictReader(f, delimiter=';')
+    with progress_file.open('rb') as fb:
+        # csv.reader y no split por línea: la Ubicacion viene del clipboard
+        # y puede traer saltos de línea dentro de un campo entre comillas
+        f = io.TextIOWrapper(fb, encoding='utf-8', newline='')
+        header = next(csv.reader(f, delimiter=';'), [])
+        if 'DNI' not in header:
+            return processed
+        idx = len(header) - 1 - header[::-1].index('DNI')  # última, como DictReader
+        if start:
+            fb = f.detach()
+            fb.seek(start)
+            f = io.TextIOWrapper(fb, encoding='utf-8', newline='')
+        reader = csv.reader(f, delimiter=';')
+
         for row in reader:
-            dni = row.get('DNI', '').strip()
-            if dni:
-                processed.add(dni)
+            if len(row) > idx:
+                dni = row[idx].strip()
+                if dni:
+                    processed.add(dni)
     return processed
 
 
+class BufferedCsvWriter:
+    """Escritor CSV que mantiene abierto el archivo de resultados.
+
+    En lugar de abrir y cerrar el archivo por cada DNI, conserva el handle
+    y el csv.writer, y hace flush cada `flush_every` filas. Las columnas de
+    origen y la posición de 'Ubicacion' se calculan una sola vez. El header
+    se escribe con la primera fila, salvo que el archivo ya tenga contenido.
+
+    Si se indica `dni_col`, cada DNI escrito se agrega también al sidecar
+    de progreso (ver progress_sidecar). Los DNIs se retienen en memoria y se
+    escriben en flush() recién después de volcar el CSV: el sidecar nunca
+    lista un DNI cuya fila no llegó al CSV.
+
+    flush() puede llamarse seguido (entre DNIs); el fsync a disco se hace
+    recién cada `flush_every` filas.
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        fieldnames: List[str],
+        flush_every: int = FLUSH_EVERY,
+        dni_col: Optional[str] = None
+    ):
+        self.path = path
+        self._header_written = path.exists() and path.stat().st_size > 0
+        self._f = path.open('a', encoding='utf-8', newline='', buffering=1 << 16)
+        self._dni_col = dni_col
+        self._sidecar = progress_sidecar(path).open('a', encoding='utf-8') if dni_col else None
+        self._sidecar_buf: List[str] = []
+        self._writer = csv.writer(self._f, delimiter=';')
+        self._cols = fieldnames
+        self._ubi_idx = fieldnames.index('Ubicacion')
+        self._src_cols = [c for c in fieldnames if c != 'Ubicacion']
+        self._flush_every = flush_every
+        self._pending = 0
+        self._unsynced = 0
+
+    def write(self, row_data: dict, ubicacion: str) -> None:
+        """Escribe el registro original con la ubicación en su columna."""
+        if not self._header_written:
+            self._writer.writerow(self._cols)
+            self._header_written = True
+        row = [row_data.get(c, '') for c in self._src_cols]
+        row.insert(self._ubi_idx, ubicacion)
+        self._writer.writerow(row)
+        if self._sidecar is not None:
+            self._sidecar_buf.append(row_data.get(self._dni_col, '').strip())
+        self._pending += 1
+        self._unsynced += 1
+        if self._pending >= self._flush_every:
+            self.flush()
+
+    def flush(self) -> None:
+        sync = self._unsynced >= self._flush_every
+        if not self._f.closed:
+            self._f.flush()
+            if sync:
+                os.fsync(self._f.fileno())
+        if self._sidecar is not None and not self._sidecar.closed and self._sidecar_buf:
+            csv_size = os.fstat(self._f.fileno()).st_size
+            self._sidecar.write(''.join(f"{dni}\n" for dni in self._sidecar_buf) + f"#{csv_size}\n")
+            self._sidecar_buf.clear()
+            self._sidecar.flush()
+            if sync:
+                os.fsync(self._sidecar.fileno())
+        if sync:
+            self._unsynced = 0
+        self._pending = 0
+
+    def close(self) -> None:
+        if not self._f.closed:
+            self.flush()
+            self._f.close()
+        if self._sidecar is not None and not self._sidecar.closed:
+            self._sidecar.close()
+
+    def __enter__(self) -> 'BufferedCsvWriter':
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+class FailureLog:
+    """Archivo de fallos (TSV) abierto una sola vez, con flush cada N líneas.
+
+    Se escribe en binario sobre un file descriptor: las líneas se codifican
+    a un bytearray y se vuelcan con un único os.write por flush.
+    """
+
+    def __init__(self, path: Path, flush_every: int = FLUSH_EVERY):
+        self.path = path
+        # O_BINARY (solo Windows): sin traducción de fin de línea; el fin de
+        # línea se escribe explícito (os.linesep, CRLF en Windows) para
+        # conservar el formato que tenía el archivo abierto en modo texto
+        flags = os.O_WRONLY | os.O_APPEND | os.O_CREAT | getattr(os, 'O_BINARY', 0)
+        self._fd = os.open(str(path), flags, 0o644)
+        self._buf = bytearray()
+        self._flush_every = flush_every
+        self._pending = 0
+        self._unsynced = 0
+        # (segundo, texto): el timestamp se formatea una vez por segundo
+        self._last_ts = (0, '')
+
+    def write(self, dni: str, reason: str) -> None:
+        now = int(time.time())
+        if now != self._last_ts[0]:
+            self._last_ts = (now, datetime.fromtimestamp(now).strftime('%Y-%m-%d %H:%M:%S'))
+        self._buf += f"{dni}\t{reason}\t{self._last_ts[1]}{os.linesep}".encode('utf-8')
+        self._pending += 1
+        self._unsynced += 1
+        if self._pending >= self._flush_every:
+            self.flush()
+
+    def flush(self) -> None:
+        if self._fd is not None and self._buf:
+            os.write(self._fd, self._buf)
+            self._buf.clear()
+            if self._unsynced >= self._flush_every:
+                os.fsync(self._fd)
+                self._unsynced = 0
+        self._pending = 0
+
+    def close(self) -> None:
+        if self._fd is not None:
+            self.flush()
+            os.close(self._fd)
+            self._fd = None
+
+    def __enter__(self) -> 'FailureLog':
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
 def save_result(
-    results_file: Path,
+    results_writer: BufferedCsvWriter,
     row_data: dict,
-    ubicacion: str,
-    fieldnames: List[str],
-    write_header: bool = False
+    ubicacion: str
 ) -> None:
     """Guarda un resultado exitoso en formato CSV con todas las columnas.
 
     Args:
-        results_file: Path al archivo de resultados (CSV)
+        results_writer: Escritor del archivo de resultados (CSV)
         row_data: Diccionario con todos los datos del registro original
         ubicacion: Ubicación/dirección obtenida del scraping
-        fieldnames: Lista de nombres de columnas para el CSV
-        write_header: Si True, escribe el header (solo para el primer registro)
     """
     # Limpiar la ubicación de saltos de línea
-    ubicacion_clean = ubicacion.replace('\n', ' ').replace('\r', ' ').strip()
-
-    # Crear copia del registro y agregar la ubicación
-    output_row = {col: row_data.get(col, '') for col in fieldnames if col != 'Ubicacion'}
-    output_row['Ubicacion'] = ubicacion_clean
+    ubicacion_clean = ubicacion.translate(_NL_TABLE).strip()
 
-    with results_file.open('a', encoding='utf-8', newline='') as f:
-        writer = csv.DictWriter(f, fieldnames=fieldnames, delimiter=';', extrasaction='ignore')
-        if write_header:
-            writer.writeheader()
-        writer.writerow(output_row)
+    results_writer.write(row_data, ubicacion_clean)
 
 
-def save_failure(failures_file: Path, dni: str, reason: str) -> None:
+def save_failure(failures_log: FailureLog, dni: str, reason: str) -> None:
     """Guarda un fallo.
 
     Args:
-        failures_file: Path al archivo de fallos
+        failures_log: Archivo de fallos
         dni: DNI que falló
         reason: Razón del fallo
     """
-    with failures_file.open('a', encoding='utf-8') as f:
-        timestamp = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-        f.write(f"{dni}\t{reason}\t{timestamp}\n")
+    failures_log.write(dni, reason)
 
 
 # ============================================================================
 # PROCESAMIENTO DE DNI - FUNCIONES AUXILIARES
 # ============================================================================
 
-def search_dni(dni: str, coords: dict) -> None:
+def search_dni(dni: str, coords: Coords) -> None:
     """Realiza la búsqueda del DNI en el input.
 
     Args:
         dni: DNI a buscar
-        coords: Diccionario con coordenadas
+        coords: Coordenadas validadas
     """
-    logger.debug(f"Buscando DNI: {dni}")
-    input_coords = coords['dni_input']
-
-    click(input_coords['x'], input_coords['y'], 'Input DNI', DELAY_CLICK)
-
-    logger.debug("Ctrl+A (seleccionar todo)")
-    pg.hotkey('ctrl', 'a')
-    time.sleep(DELAY_SHORT)
+    logger.debug("Buscando DNI: %s", dni)
 
-    logger.debug("Backspace (borrar)")
-    pg.press('backspace')
-    time.sleep(DELAY_SHORT)
+    # El DNI se carga en el clipboard antes de tocar la UI
+    pasted = set_clipboard(dni)
 
-    type_text(dni, DELAY_CLICK)
+    click(*coords.dni_input, 'Input DNI', DELAY_CLICK)
 
-    logger.debug("Enter (buscar)")
+    # Ctrl+A y luego pegar/tipear: lo nuevo reemplaza la selección, sin backspace
+    pg.hotkey('ctrl', 'a')
+    if pasted:
+        pg.hotkey('ctrl', 'v')
+    else:
+        logger.debug("Clipboard no disponible, tipeando DNI")
+        type_text(dni, 0)
     pg.press('enter')
     time.sleep(DELAY_SEARCH_WAIT)
 
 
 def copy_and_validate_name(
     nombre_csv: str,
-    coords: dict,
-    failures_file: Path
+    coords: Coords,
+    failures_log: FailureLog,
+    csv_words: Optional[FrozenSet[str]] = None
 ) -> Optional[str]:
     """Copia el nombre y valida que coincida con el CSV.
 
     Args:
         nombre_csv: Nombre esperado del CSV
-        coords: Diccionario con coordenadas
-        failures_file: Path al archivo de fallos (no usado aquí, por compatibilidad)
+        coords: Coordenadas validadas
+        failures_log: Archivo de fallos (no usado aquí, por compatibilidad)
+        csv_words: Palabras ya normalizadas de nombre_csv (si se precalcularon)
 
     Returns:
         Nombre copiado si es válido, None si no coincide o falla
     """
     clear_clipboard()
-    first_result = coords['first_result']
-    right_click(first_result['x'], first_result['y'], 'Primera cuenta', DELAY_MEDIUM)
+    right_click(*coords.first_result, 'Primera cuenta', DELAY_MEDIUM)
 
-    copy_name_menu = coords['copy_name_menu']
-    click(copy_name_menu['x'], copy_name_menu['y'], 'Copiar nombre', DELAY_MEDIUM)
+    click(*coords.copy_name_menu, 'Copiar nombre', DELAY_MEDIUM)
 
-    time.sleep(CLIPBOARD_RETRY_DELAY)
-    nombre_copiado = get_clipboard()
+    nombre_copiado = wait_clipboard()
 
     if not nombre_copiado.strip():
         logger.error("No se copio ningun nombre")
         return None
 
-    logger.debug(f"Nombre copiado: {nombre_copiado}")
+    logger.debug("Nombre copiado: %s", nombre_copiado)
 
-    if not names_match(nombre_csv, nombre_copiado):
-        logger.warning(f"Nombre no coincide - CSV: {nombre_csv}, Copiado: {nombre_copiado}")
+    if not names_match(csv_words if csv_words is not None else nombre_csv, nombre_copiado):
+        logger.warning("Nombre no coincide - CSV: %s, Copiado: %s", nombre_csv, nombre_copiado)
         return None
 
     logger.debug("Nombre validado OK")
     return nombre_copiado
 
 
-def copy_address_with_retry(coords: dict) -> Optional[str]:
-    """Copia la dirección con manejo de reintento en caso de error.
+def _select_and_copy(coords: Coords, label_suffix: str = '') -> str:
+    """Selecciona todo el detalle y lo copia al clipboard.
 
     Args:
-        coords: Diccionario con coordenadas
+        coords: Coordenadas validadas
+        label_suffix: Sufijo para las etiquetas de log (ej. ' (reintento)')
 
     Returns:
-        Dirección copiada o None si falla
+        Contenido copiado (vacío si no se copió nada)
     """
-    def attempt_copy_address() -> Optional[str]:
-        """Intento de copiar dirección."""
-        right_click_addr = coords['right_click_address']
-        right_click(right_click_addr['x'], right_click_addr['y'], 'Menu contextual', DELAY_MEDIUM)
+    right_click(*coords.right_click_address, f'Menu contextual{label_suffix}', DELAY_MEDIUM)
+    click(*coords.select_all_menu, f'Seleccionar todo{label_suffix}', DELAY_MEDIUM)
+    right_click(*coords.right_click_copy, f'Menu copiar{label_suffix}', DELAY_MEDIUM)
 
-        select_all_menu = coords['select_all_menu']
-        click(select_all_menu['x'], select_all_menu['y'], 'Seleccionar todo', DELAY_MEDIUM)
+    clear_clipboard()
+    # Sin delay fijo: wait_clipboard retorna apenas llega la copia y su
+    # deadline (CLIPBOARD_WAIT_TIMEOUT) cubre el DELAY_MEDIUM que había acá
+    click(*coords.copy_menu, f'Copiar{label_suffix}', 0)
+    return wait_clipboard(timeout=CLIPBOARD_WAIT_TIMEOUT)
 
-        right_click_copy = coords['right_click_copy']
-        right_click(right_click_copy['x'], right_click_copy['y'], 'Menu copiar', DELAY_MEDIUM)
 
-        clear_clipboard()
-        copy_menu = coords['copy_menu']
-        click(copy_menu['x'], copy_menu['y'], 'Copiar', DELAY_MEDIUM)
+def _close_error_popup(coords: Coords) -> None:
+    """Cierra el cartel de error que impide copiar la dirección."""
+    pg.click(*coords.reconnect_click)
+    time.sleep(DELAY_MEDIUM)
+    pg.press('enter')
+    time.sleep(DELAY_LONG)
+    logger.debug("Cartel cerrado, reintentando")
 
-        time.sleep(CLIPBOARD_RETRY_DELAY)
-        return get_clipboard()
 
-    # Primer intento
-    direccion = attempt_copy_address()
+def copy_address_with_retry(coords: Coords) -> Optional[str]:
+    """Copia la dirección con manejo de reintento en caso de error.
 
+    Args:
+        coords: Coordenadas validadas
+
+    Returns:
+        Dirección copiada o None si falla
+    """
+    direccion = _select_and_copy(coords)
     if direccion.strip():
         return direccion
 
     # Reintento con cierre de cartel de error
     logger.warning("No se copio direccion - intentando cerrar cartel y reintentar")
+    _close_error_popup(coords)
 
-    reconnect = coords.get('reconnect_click', {})
-    if reconnect.get('x') and reconnect.get('y'):
-        pg.moveTo(reconnect['x'], reconnect['y'], duration=MOUSE_MOVE_DURATION)
-        pg.click()
-        time.sleep(DELAY_MEDIUM)
-        pg.press('enter')
-        time.sleep(DELAY_LONG)
-        logger.debug("Cartel cerrado, reintentando")
-
-        direccion = attempt_copy_address()
-
-        if direccion.strip():
-            logger.info("Direccion copiada exitosamente en reintento")
-            return direccion
+    direccion = _select_and_copy(coords, ' (reintento)')
+    if direccion.strip():
+        logger.info("Direccion copiada exitosamente en reintento")
+        return direccion
 
     logger.error("No se pudo copiar direccion tras reintento")
     return None
@@ -934,11 +1492,11 @@ def process_dni(
     row_data: dict,
     dni_col: str,
     nombre_col: str,
-    coords: dict,
-    results_file: Path,
-    failures_file: Path,
-    fieldnames: List[str],
-    write_header: bool = False
+    coords: Coords,
+    results_writer: BufferedCsvWriter,
+    failures_log: FailureLog,
+    block_state: BlockCheckState,
+    csv_words: Optional[FrozenSet[str]] = None
 ) -> str:
     """Procesa un DNI individual.
 
@@ -946,11 +1504,11 @@ def process_dni(
         row_data: Diccionario con todos los datos del registro
         dni_col: Nombre de la columna DNI
         nombre_col: Nombre de la columna de nombre
-        coords: Diccionario con coordenadas
-        results_file: Path al archivo de resultados
-        failures_file: Path al archivo de fallos
-        fieldnames: Lista de nombres de columnas para el CSV de salida
-        write_header: Si True, escribe el header (solo para el primer registro)
+        coords: Coordenadas validadas
+        results_writer: Escritor del archivo de resultados
+        failures_log: Archivo de fallos
+        block_state: Estado del throttle del chequeo de bloqueo (por corrida)
+        csv_words: Palabras ya normalizadas del nombre del CSV (si se precalcularon)
 
     Returns:
         'ok': Procesado exitosamente
@@ -960,60 +1518,67 @@ def process_dni(
     dni = row_data.get(dni_col, '').strip()
     nombre_csv = row_data.get(nombre_col, '').strip()
 
-    logger.info(f"{'='*50}")
-    logger.info(f"Procesando DNI: {dni} - Nombre esperado: {nombre_csv}")
-    logger.info(f"{'='*50}")
+    logger.info(SEP)
+    logger.info("Procesando DNI: %s - Nombre esperado: %s", dni, nombre_csv)
+    logger.info(SEP)
 
     try:
         # Paso 1-5: Buscar DNI
         search_dni(dni, coords)
 
         # Paso 6-7: Copiar y validar nombre
-        nombre_valido = copy_and_validate_name(nombre_csv, coords, failures_file)
+        nombre_valido = copy_and_validate_name(nombre_csv, coords, failures_log, csv_words)
         if nombre_valido is None:
-            save_failure(failures_file, dni, "no creado - nombre no coincide o sin nombre")
+            save_failure(failures_log, dni, "no creado - nombre no coincide o sin nombre")
+            block_state.consecutive_fails += 1
 
             # Verificar si sistema está bloqueado
-            if check_system_blocked(coords):
+            if not should_check_blocked(block_state):
+                logger.debug("Chequeo de bloqueo omitido (fallo aislado)")
+            elif check_system_blocked(coords):
+                block_state.last_check_ts = time.monotonic()
                 logger.info("Sistema bloqueado, cerrando DNI actual y ejecutando recuperación")
-                close_btn = coords['close_btn']
-                click(close_btn['x'], close_btn['y'], 'Cerrar DNI', DELAY_MEDIUM)
+                click(*coords.close_btn, 'Cerrar DNI', DELAY_MEDIUM)
                 execute_system_recovery(coords)
+                block_state.consecutive_fails = 0
             else:
+                block_state.last_check_ts = time.monotonic()
                 logger.debug("Sistema OK - continuando con siguiente DNI")
 
             return "vpn_issue"
 
+        block_state.consecutive_fails = 0
+
         # Paso 8: Abrir detalle
-        first_result = coords['first_result']
-        click(first_result['x'], first_result['y'], 'Primera cuenta', DELAY_DETAIL_OPEN)
+        click(*coords.first_result, 'Primera cuenta', DELAY_DETAIL_OPEN)
 
         # Paso 9-12: Copiar dirección con reintento automático
         direccion = copy_address_with_retry(coords)
 
         if direccion:
-            logger.info(f"Direccion copiada: {direccion[:100]}...")
-            save_result(results_file, row_data, direccion, fieldnames, write_header)
+            logger.info("Direccion copiada: %.100s...", direccion)
+            save_result(results_writer, row_data, direccion)
         else:
-            save_failure(failures_file, dni, "Sin direccion copiada - fallo tras reintento")
+            save_failure(failures_log, dni, "Sin direccion copiada - fallo tras reintento")
 
-        # Paso 13: Cerrar ventana
-        close_btn = coords['close_btn']
-        click(close_btn['x'], close_btn['y'], 'Cerrar', DELAY_MEDIUM)
+        # Paso 13: Cerrar ventana (salvo que se pueda buscar con el detalle abierto)
+        if not (direccion and KEEP_DETAIL_OPEN):
+            click(*coords.close_btn, 'Cerrar', DELAY_MEDIUM)
 
         return "ok" if direccion else "error"
 
     except KeyboardInterrupt:
+        # No perder filas pendientes en el buffer
+        results_writer.flush()
+        failures_log.flush()
         raise
     except Exception as e:
         logger.error(f"Error inesperado procesando DNI {dni}: {e}", exc_info=True)
-        save_failure(failures_file, dni, f"Exception: {str(e)}")
+        save_failure(failures_log, dni, f"Exception: {str(e)}")
 
         # Intentar cerrar ventana en caso de error
         try:
-            close_btn = coords.get('close_btn', {})
-            if close_btn.get('x') and close_btn.get('y'):
-                click(close_btn['x'], close_btn['y'], 'Cerrar (recovery)', DELAY_MEDIUM)
+            click(*coords.close_btn, 'Cerrar (recovery)', DELAY_MEDIUM)
         except Exception:
             pass
 
@@ -1029,7 +1594,8 @@ def run(
     csv_path: Path,
     coords_path: Path,
     output_dir: Optional[Path] = None,
-    start_delay: float = 3.0
+    start_delay: float = 3.0,
+    resume_file: Optional[Path] = None
 ) -> None:
     """Ejecuta el proceso masivo de scraping.
 
@@ -1038,6 +1604,8 @@ def run(
         coords_path: Path al archivo JSON con coordenadas
         output_dir: Directorio para archivos de salida (default: Result)
         start_delay: Segundos de espera antes de empezar (default: 3.0)
+        resume_file: CSV de resultados de una corrida anterior; si se indica,
+            se omiten sus DNIs y los nuevos resultados se agregan a ese archivo
     """
     # Configurar archivos de salida
     if output_dir is None:
@@ -1050,10 +1618,16 @@ def run(
     log_file = setup_logging(output_dir, timestamp)
 
     # Configurar PyAutoGUI
-    setup_pyautogui(DELAY_CLICK)
+    setup_pyautogui(PYAUTOGUI_PAUSE)
 
-    # Archivos de salida
-    results_file = output_dir / f'{RESULTS_FILE_PREFIX}_{timestamp}.csv'
+    # Archivos de salida (al retomar, los resultados siguen en el CSV anterior)
+    if resume_file is not None:
+        if not resume_file.exists():
+            logger.error(f"No existe el archivo de resultados a retomar: {resume_file}")
+            sys.exit(1)
+        results_file = resume_file
+    else:
+        results_file = output_dir / f'{RESULTS_FILE_PREFIX}_{timestamp}.csv'
     failures_file = output_dir / f'{FAILURES_FILE_PREFIX}_{timestamp}.tsv'
     vpn_log_file = output_dir / f'{VPN_LOG_FILE_PREFIX}_{timestamp}.txt'
 
@@ -1066,11 +1640,11 @@ def run(
     coords = load_coords(coords_path)
 
     # Inicializar archivo de log VPN
-    with vpn_log_file.open('w', encoding='utf-8') as f:
-        f.write(f"[{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] Inicio sesion - VPN Host: {VPN_HOST}\n")
+    setup_vpn_logging(vpn_log_file)
+    vpn_logger.info(f"Inicio sesion - VPN Host: {VPN_HOST}")
 
     # Cargar DNIs ya procesados (por si se retoma)
-    processed = load_progress(results_file)
+    processed = frozenset(load_progress(results_file))
     logger.info(f"DNIs ya procesados: {len(processed)}")
 
     # Leer CSV
@@ -1078,26 +1652,20 @@ def run(
         logger.error(f"No existe el archivo CSV: {csv_path}")
         sys.exit(1)
 
-    registros = []  # Lista de diccionarios con todos los datos del registro
     with csv_path.open('r', encoding='utf-8', errors='ignore') as f:
-        # Detectar delimitador
-        sample = f.read(2048)
+        # Detectar delimitador mirando solo la línea de header
+        header_line = f.readline()
         f.seek(0)
-        delimiter = ';' if sample.count(';') > sample.count(',') else ','
-
-        reader = csv.DictReader(f, delimiter=delimiter)
-        input_fieldnames = reader.fieldnames or []
-
-        # Buscar columna de DNI (puede llamarse DNI, dni, Dni, documento, etc.)
-        dni_col = None
-        nombre_col = None
-        if input_fieldnames:
-            for col in input_fieldnames:
-                col_lower = col.lower()
-                if col_lower in ['dni', 'documento', 'doc', 'nro_documento']:
-                    dni_col = col
-                if 'nombre' in col_lower or 'cliente' in col_lower:
-                    nombre_col = col
+        delimiter = ';' if header_line.count(';') > header_line.count(',') else ','
+
+        reader = csv.reader(f, delimiter=delimiter)
+        input_fieldnames = next(reader, [])
+
+        # Buscar columna de DNI (puede llamarse DNI, dni, Dni, documento, etc.):
+        # si hay varias, la última, igual que para el nombre
+        dni_col = next((col for col in reversed(input_fieldnames) if DNI_COL_RE.match(col)), None)
+        # Columna de nombre: la última que contenga 'nombre' o 'cliente'
+        nombre_col = next((col for col in reversed(input_fieldnames) if NOMBRE_COL_RE.search(col)), None)
 
         if not dni_col:
             logger.error("No se encontro columna de DNI en el CSV")
@@ -1112,15 +1680,51 @@ def run(
         logger.info(f"Usando columna DNI: {dni_col}")
         logger.info(f"Usando columna Nombre: {nombre_col}")
 
-        for row in reader:
-            dni = row.get(dni_col, '').strip()
+        # Arrays paralelos (structure of arrays): DNI, palabras normalizadas
+        # del nombre (se normaliza una sola vez y se reutiliza en reintentos)
+        # y los valores crudos de la fila como tupla. El dict del registro
+        # solo se arma al procesar cada DNI (ver row_at). Con nombres de
+        # columna repetidos se usa la última aparición, igual que el dict de
+        # row_at (y que el DictReader original).
+        last = len(input_fieldnames) - 1
+        dni_idx = last - input_fieldnames[::-1].index(dni_col)
+        nombre_idx = last - input_fieldnames[::-1].index(nombre_col)
+        dnis: List[str] = []
+        nombres_words: List[FrozenSet[str]] = []
+        extras: List[Tuple[str, ...]] = []
+        seen = set()  # DNIs repetidos en el CSV: solo se procesa la primera fila
+        duplicados = 0
+        for values in reader:
+            if len(values) <= dni_idx:
+                continue
+            dni = values[dni_idx].strip()
+            if dni in seen:
+                duplicados += 1
+                continue
             if dni and dni not in processed:
-                registros.append(row)
+                seen.add(dni)
+                dnis.append(dni)
+                nombre = values[nombre_idx].strip() if nombre_idx < len(values) else ''
+                nombres_words.append(normalize_name(nombre))
+                extras.append(tuple(values))
+
+    def row_at(idx: int) -> dict:
+        """Reconstruye el registro completo (columna -> valor) de la fila idx."""
+        return dict(zip(input_fieldnames, extras[idx]))
 
     # Fieldnames para el archivo de salida (columnas originales + Ubicacion)
     output_fieldnames = list(input_fieldnames) + ['Ubicacion']
 
-    total = len(registros)
+    if resume_file is not None:
+        with results_file.open('r', encoding='utf-8', newline='') as f:
+            prev_header = next(csv.reader([f.readline()], delimiter=';'), [])
+        if prev_header and prev_header != output_fieldnames:
+            logger.warning("Las columnas de %s no coinciden con el CSV de entrada: "
+                           "las filas nuevas se agregan con las columnas actuales", results_file.name)
+
+    total = len(dnis)
+    if duplicados:
+        logger.info(f"DNIs duplicados en el CSV (omitidos): {duplicados}")
     logger.info(f"Total DNIs a procesar: {total}")
 
     if total == 0:
@@ -1136,88 +1740,86 @@ def run(
     exitosos = 0
     fallidos = 0
     consecutive_failures = 0  # Contador de fallos consecutivos (vpn_issue o error)
-    failed_rows = []  # Registros que fallaron consecutivamente
+    # Registros que fallaron consecutivamente: dni -> índice en los arrays
+    failed_map: Dict[str, int] = {}
+    block_state = BlockCheckState()  # Throttle del chequeo de sistema bloqueado
 
     # Tracking de eventos VPN
     vpn_events = []  # Lista de eventos de caida de VPN
     total_retries = 0
     total_retries_exitosos = 0
 
-    # Control de header CSV (solo escribir una vez)
-    header_written = results_file.exists() and results_file.stat().st_size > 0
+    # Archivos de salida abiertos una sola vez para toda la corrida
+    results_writer = BufferedCsvWriter(results_file, output_fieldnames, dni_col=dni_col)
+    failures_log = FailureLog(failures_file)
+    atexit.register(results_writer.close)
+    atexit.register(failures_log.close)
 
     i = 0
-    while i < len(registros):
-        row_data = registros[i]
-        dni = row_data.get(dni_col, '').strip()
-        logger.info(f"[{i+1}/{total}] ({exitosos} exitosos, {fallidos} fallidos)")
-
-        # Determinar si escribir header (solo si archivo vacío/nuevo)
-        write_header = not header_written
+    while i < total:
+        dni, csv_words, row_data = dnis[i], nombres_words[i], row_at(i)
+        logger.info("[%d/%d] (%d exitosos, %d fallidos)", i + 1, total, exitosos, fallidos)
 
         result = process_dni(
             row_data, dni_col, nombre_col, coords,
-            results_file, failures_file, output_fieldnames, write_header
+            results_writer, failures_log, block_state, csv_words
         )
 
-        # Si fue exitoso, marcar que el header ya fue escrito
-        if result == "ok" and not header_written:
-            header_written = True
-
         if result == "ok":
             exitosos += 1
             consecutive_failures = 0
-            failed_rows = []
+            failed_map.clear()
         elif result == "vpn_issue" or result == "error":
             # Cualquier fallo (sin nombre o nombre no coincide) cuenta
             fallidos += 1
             consecutive_failures += 1
-            failed_rows.append(row_data)
+            failed_map[dni] = i
 
             # Si hay 3+ fallos consecutivos, verificar si es problema de sistema
             if consecutive_failures >= MAX_CONSECUTIVE_FAILURES:
-                failed_dnis_list = [r.get(dni_col, '') for r in failed_rows]
+                failed_dnis_list = list(failed_map)
                 logger.warning("*" * 60)
                 logger.warning("DETENCION POR FALLOS CONSECUTIVOS")
                 logger.warning("*" * 60)
-                logger.warning(f"Detectados {consecutive_failures} fallos consecutivos")
-                logger.warning(f"DNIs afectados: {failed_dnis_list}")
+                logger.warning("Detectados %d fallos consecutivos", consecutive_failures)
+                logger.warning("DNIs afectados: %s", failed_dnis_list)
                 logger.info("Verificando conectividad y estado del sistema...")
 
                 # Log del evento
-                with vpn_log_file.open('a', encoding='utf-8') as f:
-                    f.write(f"\n[{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] {consecutive_failures} fallos consecutivos - DNIs: {', '.join(failed_dnis_list)}\n")
+                vpn_logger.info("%d fallos consecutivos - DNIs: %s", consecutive_failures, ', '.join(failed_dnis_list))
 
                 if not check_vpn():
+                    # Volcar lo pendiente antes de una espera que puede ser larga
+                    results_writer.flush()
+                    failures_log.flush()
+
                     # VPN caida - esperar reconexion (el scraping se detiene aqui)
-                    vpn_event = wait_for_vpn(vpn_log_file)
+                    vpn_event = wait_for_vpn()
                     vpn_event['dnis_afectados'] = failed_dnis_list
                     vpn_events.append(vpn_event)
 
                     # Click de reconexion y Enter para activar el sistema
-                    reconnect_click_action(coords, vpn_log_file)
+                    reconnect_click_action(coords)
 
                     # Limpiar popups que pueden haber aparecido
-                    clear_vpn_popup(coords, vpn_log_file)
+                    clear_vpn_popup(coords)
 
                     # Reintentar los DNIs que fallaron por VPN
                     logger.info("=" * 60)
-                    logger.info(f"REINTENTANDO {len(failed_rows)} DNIs QUE FALLARON POR VPN")
+                    logger.info(f"REINTENTANDO {len(failed_map)} DNIs QUE FALLARON POR VPN")
                     logger.info("=" * 60)
 
                     # Log inicio de reintentos
-                    with vpn_log_file.open('a', encoding='utf-8') as f:
-                        f.write(f"[{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] "
-                               f"Reintentos iniciados - Total: {len(failed_rows)}\n")
+                    vpn_logger.info(f"Reintentos iniciados - Total: {len(failed_map)}")
 
                     retries_ok = 0
                     retries_fail = 0
-                    for j, retry_row in enumerate(failed_rows, 1):
-                        retry_dni = retry_row.get(dni_col, '').strip()
-                        logger.info(f"[REINTENTO {j}/{len(failed_rows)}] DNI: {retry_dni}")
+                    retry_items = list(failed_map.items())
+                    for j, (retry_dni, retry_idx) in enumerate(retry_items, 1):
+                        logger.info("[REINTENTO %d/%d] DNI: %s", j, len(retry_items), retry_dni)
                         retry_result = process_dni(
-                            retry_row, dni_col, nombre_col, coords,
-                            results_file, failures_file, output_fieldnames, not header_written
+                            row_at(retry_idx), dni_col, nombre_col, coords,
+                            results_writer, failures_log, block_state, nombres_words[retry_idx]
                         )
                         total_retries += 1
                         if retry_result == "ok":
@@ -1225,18 +1827,15 @@ def run(
                             total_retries_exitosos += 1
                             exitosos += 1
                             fallidos -= 1  # Descontar el fallo anterior
-                            if not header_written:
-                                header_written = True
-                            logger.info(f"  -> EXITO en reintento")
+                            failed_map.pop(retry_dni)
+                            logger.info("  -> EXITO en reintento")
                             # Log reintento exitoso
-                            with vpn_log_file.open('a', encoding='utf-8') as f:
-                                f.write(f"  DNI {retry_dni}: EXITO\n")
+                            vpn_logger.info("  DNI %s: EXITO", retry_dni)
                         else:
                             retries_fail += 1
-                            logger.warning(f"  -> FALLO en reintento ({retry_result})")
+                            logger.warning("  -> FALLO en reintento (%s)", retry_result)
                             # Log reintento fallido
-                            with vpn_log_file.open('a', encoding='utf-8') as f:
-                                f.write(f"  DNI {retry_dni}: FALLO ({retry_result})\n")
+                            vpn_logger.info("  DNI %s: FALLO (%s)", retry_dni, retry_result)
 
                     logger.info(f"Resultado reintentos: {retries_ok} exitosos, {retries_fail} fallidos")
                     logger.info("=" * 60)
@@ -1244,40 +1843,46 @@ def run(
                     logger.info("=" * 60)
 
                     # Log resumen de reintentos
-                    with vpn_log_file.open('a', encoding='utf-8') as f:
-                        f.write(f"[{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] Reintentos finalizados - Exitosos: {retries_ok} - Fallidos: {retries_fail}\n")
+                    vpn_logger.info(f"Reintentos finalizados - Exitosos: {retries_ok} - Fallidos: {retries_fail}")
 
                     vpn_event['retries_ok'] = retries_ok
                     vpn_event['retries_fail'] = retries_fail
 
                     # Reiniciar contadores
                     consecutive_failures = 0
-                    failed_rows = []
+                    failed_map.clear()
                 else:
                     # VPN esta bien, puede ser otro problema (popup, error del sistema, etc)
                     logger.info("VPN activa (ping OK) - detectando otro problema...")
                     logger.info("Verificando si hay popup o cartel bloqueando...")
 
-                    with vpn_log_file.open('a', encoding='utf-8') as f:
-                        f.write(f"[{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] "
-                               f"VPN activa (ping OK) - Otro problema detectado\n")
+                    vpn_logger.info("VPN activa (ping OK) - Otro problema detectado")
 
                     # Verificar si sistema está bloqueado y ejecutar recuperación
                     if check_system_blocked(coords):
-                        execute_system_recovery(coords, vpn_log_file)
+                        execute_system_recovery(coords)
                     else:
                         logger.debug("Popup verificado OK - sin bloqueos detectados")
 
                     consecutive_failures = 0
-                    failed_rows = []
+                    failed_map.clear()
         else:  # error
             fallidos += 1
             consecutive_failures = 0
-            failed_rows = []
+            failed_map.clear()
 
         i += 1
-        # Pequena pausa entre DNIs
-        time.sleep(DELAY_BETWEEN_DNIS)
+        # Pequena pausa entre DNIs: se aprovecha para volcar la salida
+        # y solo se duerme lo que resta del intervalo
+        pause_end = time.monotonic() + DELAY_BETWEEN_DNIS
+        results_writer.flush()
+        failures_log.flush()
+        remaining = pause_end - time.monotonic()
+        if remaining > 0:
+            time.sleep(remaining)
+
+    results_writer.close()
+    failures_log.close()
 
     # Resumen final
     logger.info("=" * 50)
@@ -1314,18 +1919,15 @@ def run(
         logger.info(f"    Total pings: {total_pings}")
         logger.info(f"    Reintentos: {total_retries} ({total_retries_exitosos} exitosos)")
 
-        with vpn_log_file.open('a', encoding='utf-8') as f:
-            f.write(f"[{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] Sesion finalizada - "
-                   f"Desconexiones: {len(vpn_events)} - Tiempo caido: {int(total_duration // 60)}m "
-                   f"{int(total_duration % 60)}s - Pings: {total_pings} - "
-                   f"Reintentos: {total_retries_exitosos}/{total_retries}\n")
+        vpn_logger.info(f"Sesion finalizada - "
+                        f"Desconexiones: {len(vpn_events)} - Tiempo caido: {int(total_duration // 60)}m "
+                        f"{int(total_duration % 60)}s - Pings: {total_pings} - "
+                        f"Reintentos: {total_retries_exitosos}/{total_retries}")
 
         logger.info(f"Log detallado de VPN guardado en: {vpn_log_file}")
     else:
         # Si no hubo eventos VPN, cerrar el log
-        with vpn_log_file.open('a', encoding='utf-8') as f:
-            f.write(f"\n[{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] "
-                   f"Sesion finalizada - Sin caidas de VPN\n")
+        vpn_logger.info("Sesion finalizada - Sin caidas de VPN")
 
 
 # ============================================================================
@@ -1344,6 +1946,7 @@ Ejemplos de uso:
   %(prog)s --csv dnis.csv
   %(prog)s --csv dnis.csv --coords mis_coords.json
   %(prog)s --csv dnis.csv --output-dir resultados --start-delay 5
+  %(prog)s --csv dnis.csv --resume Result/resultados_20260130_095244.csv
 
 Archivo CSV debe contener columnas 'DNI' y 'nombre' (o variantes).
 Archivo JSON debe contener coordenadas de clicks para todas las acciones.
@@ -1370,6 +1973,12 @@ Archivo JSON debe contener coordenadas de clicks para todas las acciones.
         default=3.0,
         help='Segundos de espera antes de empezar (default: 3.0)'
     )
+    parser.add_argument(
+        '--resume',
+        default=None,
+        help='CSV de resultados de una corrida anterior: omite los DNIs ya '
+             'procesados y agrega los nuevos resultados a ese archivo'
+    )
 
     args = parser.parse_args()
 
@@ -1378,7 +1987,8 @@ Archivo JSON debe contener coordenadas de clicks para todas las acciones.
             csv_path=Path(args.csv),
             coords_path=Path(args.coords),
             output_dir=Path(args.output_dir),
-            start_delay=args.start_delay
+            start_delay=args.start_delay,
+            resume_file=Path(args.resume) if args.resume else None
         )
     except KeyboardInterrupt:
         # Usar logger si está configurado, sino print